@@ -0,0 +1,104 @@
+"""
+Benchmark the response parser on large synthetic responses.
+
+QueryDomainList responses with an increasing number of rows are parsed with
+:func:`rrpproxypy.parser.parse_response` and with the configparser based
+parser it replaced. The parse time per row is reported for both.
+
+Usage::
+
+    python benchmarks/bench_parse.py [--rows 1000 10000 100000]
+
+"""
+import argparse
+import timeit
+
+from rrpproxypy import parser
+
+from reference_parser import configparser_response_to_dict
+
+
+COLUMNS = [
+    'domain',
+    'domain created date',
+    'domain updated date',
+    'domain registration expiration date',
+    'domain zone',
+    'renewalmode',
+]
+
+
+def domain_list_response(rows):
+    """
+    Generate a QueryDomainList response.
+
+    Args:
+        rows (int): The number of domains.
+
+    Returns:
+        str: The response text.
+
+    """
+    lines = [
+        '[RESPONSE]',
+        'code = 200',
+        'description = Command completed successfully',
+        'queuetime = 0',
+        'runtime = 0.042',
+        'property[count][0] = {}'.format(rows),
+    ]
+    for index, column in enumerate(COLUMNS):
+        lines.append('property[column][{}] = {}'.format(index, column))
+    for row in range(rows):
+        values = [
+            'example{}.com'.format(row),
+            '2019-02-15 10:00:00',
+            '2019-02-16 10:00:00',
+            '2020-02-15 10:00:00',
+            'com',
+            'DEFAULT',
+        ]
+        for column, value in zip(COLUMNS, values):
+            lines.append('property[{}][{}] = {}'.format(column, row, value))
+    lines.append('EOF')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def time_per_row(function, text, rows, repeat):
+    """
+    Time a parser.
+
+    Returns:
+        float: The best parse time per row in microseconds.
+
+    """
+    timer = timeit.Timer(lambda: function(text))
+    return min(timer.repeat(repeat=repeat, number=1)) / rows * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0])
+    arg_parser.add_argument(
+        '--rows',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 50000])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print('{:>8} {:>16} {:>16}'.format(
+        'rows', 'single pass', 'configparser'))
+    for rows in args.rows:
+        text = domain_list_response(rows)
+        assert parser.parse_response(text) == (
+            configparser_response_to_dict(text))
+        print('{:>8} {:>11.3f} us/row {:>11.3f} us/row'.format(
+            rows,
+            time_per_row(parser.parse_response, text, rows, args.repeat),
+            time_per_row(
+                configparser_response_to_dict, text, rows, args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark the latency per call with and without connection pooling.
+
+A local stand-in for the RRP API is started on a random port and a number of
+calls are made against it, once with a fresh connection per call (the old
+behaviour of `requests.get`) and once with a pooled, keep-alive
+:class:`rrpproxypy.RRPproxy`. HTTPS is used by default, using a self-signed
+certificate generated with `openssl`, since the TLS handshake is what pooling
+saves the most on.
+
+Usage::
+
+    python benchmarks/bench_pool.py --calls 500 [--http]
+
+"""
+from urllib import parse
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+
+import requests
+
+import rrpproxypy
+from rrpproxypy import standin
+
+
+def make_certificate(directory):
+    """
+    Create a self-signed certificate for localhost.
+
+    Args:
+        directory (str): The directory to write the files to.
+
+    Returns:
+        tuple: The certificate and key file paths.
+
+    """
+    certfile = os.path.join(directory, 'cert.pem')
+    keyfile = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        [
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+            '-keyout', keyfile, '-out', certfile, '-days', '1',
+            '-subj', '/CN=localhost',
+            '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1',
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL)
+    return certfile, keyfile
+
+
+def measure(call, calls):
+    """
+    Time a number of calls.
+
+    Returns:
+        list: The latency of every call in milliseconds.
+
+    """
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print('{:<10} mean {:7.3f} ms  p50 {:7.3f} ms  p99 {:7.3f} ms'.format(
+        name,
+        statistics.mean(latencies),
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99) - 1]))
+
+
+def run(
+        url,
+        verify,
+        calls):
+    """
+    Run the benchmark against a server.
+
+    Args:
+        url (str): The base URL of the server.
+        verify: The certificate to verify the server with.
+        calls (int): The number of calls to make.
+
+    """
+    query = parse.urlencode({
+        's_login': 'username',
+        's_pw': 'password',
+        'command': 'StatusDomain',
+        'domain': 'domain0.com',
+    })
+
+    def unpooled():
+        # A new session per call, like the module level `requests.get`.
+        requests.get(url + 'api/call?' + query, verify=verify).text
+
+    with rrpproxypy.RRPproxy('username', 'password', url=url) as client:
+        # Don't let REQUESTS_CA_BUNDLE override the self-signed cert.
+        client.session.trust_env = False
+        client.session.verify = verify
+
+        def pooled():
+            client.status_domain('domain0.com')
+
+        report('unpooled', measure(unpooled, calls))
+        report('pooled', measure(pooled, calls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument(
+        '--http',
+        action='store_true',
+        help='Use plain HTTP instead of HTTPS.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.http:
+            certfile, keyfile = None, None
+        else:
+            certfile, keyfile = make_certificate(directory)
+        with standin.StandInServer(
+                certfile=certfile,
+                keyfile=keyfile) as httpd:
+            run(httpd.url, certfile or True, args.calls)
+
+
+if __name__ == '__main__':
+    main()
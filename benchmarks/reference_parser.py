@@ -0,0 +1,46 @@
+"""
+The configparser based response parser which the single pass parser
+replaced.
+
+It is kept as a reference: the benchmarks compare the speed of both parsers
+and the tests check that they produce the same responses.
+
+"""
+import configparser
+
+
+def configparser_response_to_dict(response):
+    """
+    Parse a response the way the client did before the single pass parser.
+
+    Args:
+        response (str): The response text.
+
+    Returns:
+        dict: The parsed response.
+
+    """
+    response = response[:response.find('EOF', -10)]
+    config = configparser.ConfigParser(
+        interpolation=None)
+    config.read_string(response)
+    response = dict(config.items('RESPONSE'))
+    for key in sorted(response):
+        if key.startswith('property['):
+            value = response.pop(key)
+            name_end_index = key.find(']', 9)
+            name = key[9:name_end_index]
+            index_start_index = key.find('[', name_end_index) + 1
+            index_end_index = key.find(']', index_start_index)
+            index = int(key[index_start_index:index_end_index])
+            properties = response.setdefault('properties', {})
+            properties.setdefault(name, []).append((value, index))
+    for name, values in response['properties'].items():
+        values = [
+            value for value, index
+            in sorted(values, key=lambda item: item[1])]
+        if len(values) == 1:
+            response['properties'][name] = values[0]
+        else:
+            response['properties'][name] = values
+    return response
@@ -0,0 +1,275 @@
+"""
+Benchmark suite for the client, run against a local stand-in server.
+
+Measures single-call latency, sustained throughput at a number of concurrent
+workers, parse time against response size and the memory used to list 10k
+domains. The results are written as JSON, so that runs of different versions
+can be compared using `--compare`.
+
+The stand-in runs in the same process as the client, so without simulated
+latency (`--latency`) the throughput is bound by the CPU rather than by
+waiting on the network. Memory is measured against a stand-in in a
+subprocess, so that only the memory of the client is traced.
+
+Usage::
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --output new.json --compare results.json
+
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+import rrpproxypy
+from rrpproxypy import parser
+from rrpproxypy import standin
+
+
+SETUP_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'setup.py')
+
+
+def version():
+    """
+    Get the version of the package from setup.py.
+
+    """
+    with open(SETUP_PATH) as file:
+        return re.search(r"^version = '([^']*)'", file.read(), re.M).group(1)
+
+
+@contextlib.contextmanager
+def standin_process(domains, latency=0.0):
+    """
+    Serve a stand-in in a subprocess.
+
+    Yields:
+        str: The URL of the stand-in.
+
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            '-u',
+            '-m',
+            'rrpproxypy.standin',
+            '--port', '0',
+            '--domains', str(domains),
+            '--latency', str(latency),
+        ],
+        stdout=subprocess.PIPE,
+        universal_newlines=True)
+    try:
+        # The stand-in prints its URL once it is listening.
+        line = process.stdout.readline()
+        if not line.startswith('Serving on '):
+            raise RuntimeError('The stand-in failed to start')
+        yield line[len('Serving on '):].strip()
+    finally:
+        process.terminate()
+        process.wait()
+        process.stdout.close()
+
+
+def latency(client, calls):
+    """
+    Measure the latency of single, sequential calls.
+
+    Returns:
+        dict: The mean and percentiles in milliseconds.
+
+    """
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.status_domain('domain0.com')
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        'calls': calls,
+        'mean_ms': statistics.mean(latencies),
+        'p50_ms': latencies[len(latencies) // 2],
+        'p99_ms': latencies[max(0, int(len(latencies) * 0.99) - 1)],
+    }
+
+
+def throughput(client, calls, workers):
+    """
+    Measure the sustained throughput of concurrent calls.
+
+    Returns:
+        dict: The number of calls per second for every number of workers.
+
+    """
+    domains = ['domain{}.com'.format(i % 100) for i in range(calls)]
+    results = {}
+    for count in workers:
+        start = time.perf_counter()
+        errors = sum(
+            result.error is not None
+            for result in client.status_domains(domains, workers=count))
+        elapsed = time.perf_counter() - start
+        results[str(count)] = {
+            'calls_per_second': calls / elapsed,
+            'errors': errors,
+        }
+    return results
+
+
+def domain_list_text(rows):
+    """
+    Format a QueryDomainList response with the given number of rows.
+
+    """
+    domains = standin.make_domains(rows)
+    properties = {'column': list(standin.DOMAIN_COLUMNS)}
+    for column in standin.DOMAIN_COLUMNS:
+        properties[column] = [domain[column] for domain in domains]
+    return standin.format_response(200, 'OK', properties)
+
+
+def parse_time(sizes, repeat=3):
+    """
+    Measure the parse time against the response size.
+
+    Returns:
+        dict: The size and parse time for every number of rows.
+
+    """
+    results = {}
+    for rows in sizes:
+        text = domain_list_text(rows)
+        timer = timeit.Timer(lambda: parser.parse_response(text))
+        best = min(timer.repeat(repeat=repeat, number=1))
+        results[str(rows)] = {
+            'bytes': len(text),
+            'seconds': best,
+            'us_per_row': best / rows * 1e6,
+        }
+    return results
+
+
+def memory(client, domains):
+    """
+    Measure the memory used to list domains.
+
+    The stand-in must run in another process, or its memory is traced too.
+
+    Returns:
+        dict: The peak memory while paging through the domains, while
+            streaming them in a single call and the memory held by all
+            records, in bytes per 10k domains.
+
+    """
+    scale = 10000 / domains
+    tracemalloc.start()
+    for record in client.iter_domains(page_size=1000):
+        pass
+    paged = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    tracemalloc.start()
+    for record in client.stream('QueryDomainList', wide=1, limit=domains):
+        pass
+    single_call = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    tracemalloc.start()
+    records = list(client.iter_domains(page_size=1000))
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return {
+        'domains': domains,
+        'paged_peak_bytes_per_10k': int(paged * scale),
+        'single_call_stream_peak_bytes_per_10k': int(single_call * scale),
+        'records_bytes_per_10k': int(held * scale),
+    }
+
+
+def compare(old, new, path=()):
+    """
+    Print the relative change of every number between two runs.
+
+    """
+    for key, value in new.items():
+        if key not in old:
+            continue
+        if isinstance(value, dict):
+            compare(old[key], value, path + (key,))
+        elif (isinstance(value, (int, float)) and
+                not isinstance(value, bool) and old[key]):
+            change = (value - old[key]) / old[key] * 100
+            print('{:<60} {:>12.3f} {:>+8.1f}%'.format(
+                '.'.join(path + (key,)),
+                value,
+                change))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0])
+    arg_parser.add_argument('--output', default='-')
+    arg_parser.add_argument('--compare', help='A previous results file.')
+    arg_parser.add_argument('--calls', type=int, default=500)
+    arg_parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=[1, 4, 16])
+    arg_parser.add_argument(
+        '--rows',
+        type=int,
+        nargs='+',
+        default=[100, 1000, 10000])
+    arg_parser.add_argument('--domains', type=int, default=10000)
+    arg_parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Simulated server latency in seconds.')
+    args = arg_parser.parse_args()
+
+    server_standin = standin.StandIn(
+        domains=standin.make_domains(args.domains),
+        latency=args.latency)
+    with standin.StandInServer(server_standin) as server:
+        with rrpproxypy.RRPproxy(
+                'username',
+                'password',
+                url=server.url,
+                pool_maxsize=max(args.workers)) as client:
+            results = {
+                'version': version(),
+                'python': platform.python_version(),
+                'date': datetime.datetime.now().isoformat(),
+                'server_latency': args.latency,
+                'latency': latency(client, args.calls),
+                'throughput': throughput(client, args.calls, args.workers),
+                'parse': parse_time(args.rows),
+            }
+    with standin_process(args.domains, latency=args.latency) as url:
+        with rrpproxypy.RRPproxy('username', 'password', url=url) as client:
+            results['memory'] = memory(client, args.domains)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+import asyncio
+
+import aiohttp
+import yarl
+
+from rrpproxypy import client
+from rrpproxypy import exceptions
+
+
+class AsyncRRPproxy(client.BaseRRPproxy):
+    def __init__(
+            self,
+            username,
+            password,
+            test=False,
+            url=None,
+            concurrency=100,
+            pool_maxsize=100,
+            timeout=None):
+        """
+        An asyncio counterpart of :class:`rrpproxypy.RRPproxy`.
+
+        All command methods are coroutines. At most `concurrency` requests
+        are in flight at the same time; additional calls wait for a slot.
+        The HTTP session is created on first use, so the client can be
+        constructed outside of a running event loop. Call :meth:`close` (or
+        use the client as an async context manager) to release the
+        connections.
+
+        Args:
+            username (str): The RRP username.
+            password (str): The RRP password.
+
+        Keyword Args:
+            test (bool): Whether or not to use the test environment.
+            url (str): Override the API base URL.
+            concurrency (int): The maximum number of concurrent requests.
+            pool_maxsize (int): The maximum number of open connections.
+            timeout (float): The total timeout per request in seconds, or
+                `None` to wait forever.
+
+        """
+        super().__init__(
+            username,
+            password,
+            test=test,
+            url=url)
+        self.concurrency = concurrency
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close all pooled connections.
+
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        """
+        Get the HTTP session, creating it when needed.
+
+        Returns:
+            aiohttp.ClientSession: The session.
+
+        """
+        if self._session is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def convert_currency(
+            self,
+            amount,
+            from_,
+            to):
+        """
+        Convert an amount in a certain currency.
+
+        See :meth:`rrpproxypy.RRPproxy.convert_currency`.
+
+        """
+        params = {
+            'from': from_,
+        }
+        response = await self.request(
+            'ConvertCurrency',
+            amount=amount,
+            to=to,
+            **params)
+        return response
+
+    async def domain_price(
+            self,
+            domain,
+            **params):
+        """
+        Get the price for an action on a domain.
+
+        See :meth:`rrpproxypy.RRPproxy.domain_price`.
+
+        Raises:
+            Failure: When the request has failed.
+
+        """
+        response = await self.request(
+            'DomainPrice',
+            domain=domain,
+            **params
+        )
+        if int(response['code']) == 200:
+            return response
+        else:
+            raise exceptions.Failure(response['description'])
+
+    async def get_zone_info(
+            self,
+            zone,
+            **params):
+        """
+        Get information about a zone (TLD).
+
+        See :meth:`rrpproxypy.RRPproxy.get_zone_info`.
+
+        """
+        response = await self.request(
+            'GetZoneInfo',
+            zone=zone,
+            **params)
+        return response
+
+    async def query_domain_list(self):
+        """
+        Query a list of domains.
+
+        See :meth:`rrpproxypy.RRPproxy.query_domain_list`.
+
+        """
+        response = await self.request(
+            'QueryDomainList',
+            orderby='DOMAINREGISTRATIONEXPIRATIONDATE',
+            wide=1)
+        return response
+
+    async def query_exchange_rates(
+            self):
+        """
+        Query the exchange rates.
+
+        See :meth:`rrpproxypy.RRPproxy.query_exchange_rates`.
+
+        """
+        response = await self.request(
+            'QueryExchangeRates')
+        return response
+
+    async def request(
+            self,
+            command,
+            **args):
+        """
+        Perform a request.
+
+        Args:
+            command (str): The API command to call.
+
+        Keyword Args:
+            Additional arguments to the API call.
+
+        Returns:
+            The parsed response.
+
+        """
+        url = self._build_url(command, args)
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(yarl.URL(url, encoded=True)) as response:
+                text = await response.text()
+        return self._response_to_dict(text)
+
+    async def status_domain(self, domain):
+        """
+        Request the domain status.
+
+        See :meth:`rrpproxypy.RRPproxy.status_domain`.
+
+        """
+        response = await self.request(
+            'StatusDomain',
+            domain=domain)
+        return response
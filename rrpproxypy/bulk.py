@@ -0,0 +1,149 @@
+from concurrent import futures
+import collections
+import itertools
+import threading
+
+
+Result = collections.namedtuple(
+    'Result',
+    [
+        'input',
+        'response',
+        'error',
+    ])
+Result.__doc__ = """
+The result of a single call in a bulk operation.
+
+Attributes:
+    input: The input the call was made for.
+    response: The response, or `None` when the call has failed.
+    error (Exception): The error raised by the call, or `None`.
+
+"""
+
+
+class ChunkSizer:
+    def __init__(
+            self,
+            maximum,
+            target_runtime=1.0,
+            minimum=1):
+        """
+        Tune the size of chunks to the time the server takes to handle them.
+
+        The size starts at the maximum. When a chunk takes longer than the
+        target runtime the size shrinks in proportion; when chunks take less
+        than half the target it grows again, up to the maximum.
+
+        Args:
+            maximum (int): The maximum (and initial) chunk size.
+
+        Keyword Args:
+            target_runtime (float): The server runtime to aim for per chunk,
+                in seconds.
+            minimum (int): The minimum chunk size.
+
+        """
+        self.maximum = maximum
+        self.minimum = minimum
+        self.target_runtime = target_runtime
+        self.size = maximum
+        self._lock = threading.Lock()
+
+    def observe(
+            self,
+            size,
+            runtime):
+        """
+        Adjust the chunk size to the runtime of a chunk.
+
+        Args:
+            size (int): The size of the chunk.
+            runtime (float): The server runtime of the chunk in seconds.
+
+        """
+        if runtime > self.target_runtime:
+            size = int(size * self.target_runtime / runtime)
+        elif runtime < self.target_runtime / 2 and size >= self.size:
+            size = size * 2
+        else:
+            return
+        with self._lock:
+            self.size = max(self.minimum, min(self.maximum, size))
+
+
+def chunked(
+        items,
+        size):
+    """
+    Split items into lists.
+
+    The size is read again for every chunk, so it may change while the
+    chunks are consumed.
+
+    Args:
+        items (iterable): The items.
+        size (callable): Returns the size of the next chunk.
+
+    Yields:
+        list: The chunks.
+
+    """
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size()))
+        if not chunk:
+            return
+        yield chunk
+
+
+def fan_out(
+        function,
+        items,
+        workers=10):
+    """
+    Call a function for every item using a pool of worker threads.
+
+    Results are yielded as soon as they complete, so they are not in input
+    order. The number of submitted calls is bounded to twice the number of
+    workers, so the items can be a lazy iterable of any size. An exception
+    raised for an item is stored on its result and doesn't abort the other
+    calls.
+
+    Args:
+        function (callable): The function to call for every item.
+        items (iterable): The items.
+
+    Keyword Args:
+        workers (int): The number of worker threads.
+
+    Yields:
+        Result: The result for every item.
+
+    """
+    items = iter(items)
+    pending = {}
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit(count):
+            for item in itertools.islice(items, count):
+                pending[executor.submit(function, item)] = item
+
+        try:
+            submit(workers * 2)
+            while pending:
+                done, _ = futures.wait(
+                    pending,
+                    return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    try:
+                        result = Result(item, future.result(), None)
+                    except Exception as error:
+                        result = Result(item, None, error)
+                    yield result
+                submit(len(done))
+        finally:
+            # Don't run the remaining calls when the caller stops early.
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,172 @@
+import collections
+import threading
+import time
+
+
+# Read-only commands which are cached by default, with their TTL in seconds.
+DEFAULT_TTLS = {
+    'DomainPrice': 3600,
+    'GetZoneInfo': 3600,
+    'QueryExchangeRates': 3600,
+}
+
+
+def make_key(
+        command,
+        args):
+    """
+    Make a cache key for an API call.
+
+    Commands and argument names are case insensitive in the API, so they
+    are lower cased. Argument values are compared as they are sent: as
+    strings.
+
+    Args:
+        command (str): The API command.
+        args (dict): The arguments to the API call.
+
+    Returns:
+        tuple: The key.
+
+    """
+    return (
+        command.lower(),
+        tuple(sorted(
+            (name.lower(), str(value)) for name, value in args.items())))
+
+
+class TTLCache:
+    def __init__(
+            self,
+            ttls=None,
+            maxsize=1024,
+            clock=time.monotonic):
+        """
+        A thread-safe LRU cache for responses of read-only commands.
+
+        Only commands with a TTL are cached, every other command bypasses
+        the cache; the client never caches mutating commands, whatever
+        their TTL. Cached responses are shared between callers and must
+        not be modified. Responses are stored per scope (the client uses
+        its API URL and username), so a cache may be shared between clients
+        of different accounts or environments.
+
+        Keyword Args:
+            ttls (dict): The TTL in seconds by command name. Defaults to
+                :data:`DEFAULT_TTLS`.
+            maxsize (int): The maximum number of cached responses. The
+                least recently used response is evicted first.
+            clock (callable): The clock to measure the TTL with.
+
+        """
+        if ttls is None:
+            ttls = DEFAULT_TTLS
+        self.ttls = {
+            command.lower(): ttl for command, ttl in ttls.items()}
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cacheable(self, command):
+        """
+        Check whether responses to a command are cached.
+
+        Args:
+            command (str): The API command.
+
+        Returns:
+            bool: Whether the command is cached.
+
+        """
+        return command.lower() in self.ttls
+
+    def get(
+            self,
+            command,
+            args,
+            scope=None):
+        """
+        Get a cached response.
+
+        Args:
+            command (str): The API command.
+            args (dict): The arguments to the API call.
+
+        Keyword Args:
+            scope (tuple): The scope of the response, e.g. the account.
+
+        Returns:
+            The response or `None` when it isn't cached or has expired.
+
+        """
+        key = (make_key(command, args), scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, response = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def set(
+            self,
+            command,
+            args,
+            response,
+            scope=None):
+        """
+        Cache a response.
+
+        Args:
+            command (str): The API command.
+            args (dict): The arguments to the API call.
+            response: The response.
+
+        Keyword Args:
+            scope (tuple): The scope of the response, e.g. the account.
+
+        """
+        key = (make_key(command, args), scope)
+        expires = self.clock() + self.ttls[command.lower()]
+        with self._lock:
+            self._entries[key] = (expires, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(
+            self,
+            command=None,
+            **args):
+        """
+        Remove responses from the cache.
+
+        Without arguments the whole cache is cleared. With only a command
+        all responses to that command are removed. With a command and
+        arguments only that exact call is removed, in every scope.
+
+        Keyword Args:
+            command (str): The API command.
+            **args: The arguments to the API call.
+
+        """
+        with self._lock:
+            if command is None:
+                self._entries.clear()
+            else:
+                call = make_key(command, args)
+                for key in [
+                        key for key in self._entries
+                        if key[0] == call or (
+                            not args and key[0][0] == call[0])]:
+                    del self._entries[key]
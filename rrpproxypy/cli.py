@@ -0,0 +1,271 @@
+import argparse
+import json
+import sys
+
+from rrpproxypy import bulk
+from rrpproxypy import ratelimit
+from rrpproxypy import zonecache
+from rrpproxypy.args import add_arguments
+from rrpproxypy.client import RRPproxy
+
+
+def read_jobs(lines):
+    """
+    Read batch jobs, one JSON object per line.
+
+    A job has a `command` and optionally `args`, e.g.
+    `{"command": "StatusDomain", "args": {"domain": "example.com"}}`.
+    Blank lines are skipped.
+
+    Args:
+        lines (iterable): The lines of input.
+
+    Yields:
+        tuple: The line number (starting at 1), the command and the args of
+            every job. For an invalid line the command is `None` and the
+            args is the error.
+
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict) or not isinstance(
+                    job.get('command'), str):
+                raise ValueError('Expected an object with a command')
+            args = job.get('args', {})
+            if not isinstance(args, dict):
+                raise ValueError('Expected the args to be an object')
+        except ValueError as error:
+            yield number, None, error
+        else:
+            yield number, job['command'], args
+
+
+def succeeded(response):
+    """
+    Check whether a call has succeeded, i.e. its response code is 2xx.
+
+    """
+    return str(response.get('code', '')).startswith('2')
+
+
+def run_batch(
+        client,
+        lines,
+        output,
+        workers=10):
+    """
+    Run batch jobs concurrently, writing results as they complete.
+
+    Every result is written as a line of JSON holding the input `line`
+    number, the `command`, its `args` and either the `response` or the
+    `error`. Results are written in order of completion, not input order.
+    Input is read as calls complete, so it can be of any size.
+
+    A job fails when it can't be run or its response code isn't 2xx, like
+    the exit status of a single call.
+
+    Args:
+        client (RRPproxy): The client to call the API with.
+        lines (iterable): The lines of input, see :func:`read_jobs`.
+        output (file): The file to write the results to.
+
+    Keyword Args:
+        workers (int): The number of concurrent calls.
+
+    Returns:
+        int: The number of jobs which have failed.
+
+    """
+    def call(job):
+        _, command, args = job
+        if command is None:
+            raise args
+        return client.request(command, **args)
+
+    failed = 0
+    for job, response, error in bulk.fan_out(
+            call,
+            read_jobs(lines),
+            workers=workers):
+        number, command, args = job
+        result = {'line': number}
+        if command is not None:
+            result['command'] = command
+            result['args'] = args
+        if error is None:
+            result['response'] = response
+            if not succeeded(response):
+                failed += 1
+        else:
+            failed += 1
+            result['error'] = '{}: {}'.format(type(error).__name__, error)
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+    return failed
+
+
+def parse_value(argument):
+    """
+    Parse a `name=value` argument.
+
+    """
+    name, delimiter, value = argument.partition('=')
+    if not delimiter:
+        raise argparse.ArgumentTypeError(
+            'Expected name=value, got {!r}'.format(argument))
+    return name, value
+
+
+def make_parser():
+    """
+    Make the parser for the command line arguments.
+
+    Returns:
+        ArgumentParser: The parser.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='rrpproxy',
+        description='Call the RRPproxy API.')
+    add_arguments(parser)
+    parser.add_argument(
+        '--url',
+        help='Override the API base URL, e.g. for a local stand-in.')
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        help='The timeout of a call in seconds.')
+    subparsers = parser.add_subparsers(dest='action')
+    subparsers.required = True
+
+    call = subparsers.add_parser(
+        'call',
+        help='Perform a single call and print the response as JSON.')
+    call.add_argument('command', help='The API command, e.g. StatusDomain.')
+    call.add_argument(
+        'args',
+        nargs='*',
+        type=parse_value,
+        metavar='name=value',
+        help='The arguments to the command.')
+
+    batch = subparsers.add_parser(
+        'batch',
+        help='Perform calls read as lines of JSON, concurrently.')
+    batch.add_argument(
+        'input',
+        nargs='?',
+        type=argparse.FileType('r'),
+        default=sys.stdin,
+        help='A file with a job per line, e.g. {"command": "StatusDomain", '
+             '"args": {"domain": "example.com"}}. Defaults to stdin.')
+    batch.add_argument(
+        '--workers',
+        type=int,
+        default=10,
+        help='The number of concurrent calls.')
+    batch.add_argument(
+        '--rate',
+        type=float,
+        help='The maximum number of calls per second.')
+
+    warm = subparsers.add_parser(
+        'warm-zones',
+        help='Fill a shared GetZoneInfo cache for many zones concurrently.')
+    warm.add_argument('cache', help='The path of the cache database.')
+    warm.add_argument('zones', nargs='+', help='The zones, e.g. com net.')
+    warm.add_argument(
+        '--workers',
+        type=int,
+        default=10,
+        help='The number of concurrent calls.')
+    warm.add_argument(
+        '--max-age',
+        type=float,
+        default=86400,
+        help='The number of seconds cached information is fresh.')
+    return parser
+
+
+def warm_zones(
+        client,
+        cache,
+        zones,
+        output,
+        workers=10):
+    """
+    Fill a zone cache, writing a line of JSON per zone as it completes.
+
+    Returns:
+        int: The number of zones which have failed.
+
+    """
+    failed = 0
+    for zone, response, error in cache.warm(client, zones, workers=workers):
+        result = {'zone': zone}
+        if error is None and int(response['code']) != 200:
+            error = response['description']
+        if error is None:
+            result['fetched'] = cache.entry(zone)[1]
+        else:
+            failed += 1
+            result['error'] = str(error)
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+    return failed
+
+
+def main(argv=None):
+    """
+    Run the `rrpproxy` command.
+
+    Keyword Args:
+        argv (list): The command line arguments, defaults to `sys.argv`.
+
+    Returns:
+        int: The exit status.
+
+    """
+    args = make_parser().parse_args(argv)
+    if not args.rrpproxy_username or not args.rrpproxy_password:
+        print(
+            'rrpproxy: the username and password are required',
+            file=sys.stderr)
+        return 2
+
+    kwargs = {'timeout': args.timeout, 'url': args.url}
+    if args.action == 'warm-zones':
+        cache = zonecache.ZoneInfoCache(args.cache, max_age=args.max_age)
+        with RRPproxy.from_args(
+                args,
+                pool_maxsize=args.workers,
+                **kwargs) as rrpproxy:
+            failed = warm_zones(
+                rrpproxy,
+                cache,
+                args.zones,
+                sys.stdout,
+                workers=args.workers)
+        return 1 if failed else 0
+    if args.action == 'batch':
+        kwargs['pool_maxsize'] = args.workers
+        if args.rate is not None:
+            kwargs['rate_limiter'] = ratelimit.RateLimiter(args.rate)
+    with RRPproxy.from_args(args, **kwargs) as rrpproxy:
+        if args.action == 'call':
+            response = rrpproxy.request(args.command, **dict(args.args))
+            print(json.dumps(response, indent=2))
+            return 0 if succeeded(response) else 1
+        failed = run_batch(
+            rrpproxy,
+            args.input,
+            sys.stdout,
+            workers=args.workers)
+        return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
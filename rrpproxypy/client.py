@@ -1,10 +1,55 @@
+from concurrent import futures
 from urllib import parse
-import configparser
-import datetime
-
-import requests
+import random
+import threading
+import time
 
+from rrpproxypy import bulk
+from rrpproxypy import cache
 from rrpproxypy import exceptions
+from rrpproxypy import fields
+from rrpproxypy import metrics
+from rrpproxypy import parser
+from rrpproxypy import singleflight
+from rrpproxypy import transports
+
+
+# Commands which don't change anything, in lower case.
+READ_ONLY_COMMANDS = frozenset([
+    'checkdomain',
+    'checkdomains',
+    'convertcurrency',
+    'domainprice',
+    'getzoneinfo',
+    'querydomainlist',
+    'queryexchangerates',
+    'statusdomain',
+])
+
+# Response codes meaning the session has expired or is invalid.
+SESSION_EXPIRED_CODES = (530, 531)
+
+# Response codes of read-only calls which are retried.
+RETRY_CODES = (421,)
+
+# HTTP status codes meaning a throttled call certainly hasn't run, so that
+# calls which change something may be retried as well.
+NOT_RUN_STATUS_CODES = (429,)
+
+# The number of latencies to measure before read-only calls are hedged.
+HEDGE_MIN_SAMPLES = 20
+
+# The URL length above which calls are sent as a POST form body.
+POST_THRESHOLD = 2000
+
+# The headers of a POST call.
+FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+# The number of bytes to read at a time when streaming a response.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# The maximum number of domains per CheckDomains call.
+MAX_CHECK_DOMAINS = 32
 
 
 def try_parse(value):
@@ -18,20 +63,16 @@ def try_parse(value):
         The parsed value.
 
     """
-    try:
-        return datetime.datetime.strptime(
-            value,
-            '%Y-%m-%d %H:%M:%S')
-    except ValueError:
-        return value
+    return fields.parse_datetime(value)
 
 
-class RRPproxy:
+class BaseRRPproxy:
     def __init__(
             self,
             username,
             password,
-            test=False):
+            test=False,
+            url=None):
         """
         Args:
             username (str): The RRP username.
@@ -39,15 +80,63 @@ class RRPproxy:
 
         Keyword Args:
             test (bool): Whether or not to use the test environment.
+            url (str): Override the API base URL (e.g. for a local
+                stand-in server).
 
         """
-        if test:
+        if url is not None:
+            self.url = url
+        elif test:
             self.url = 'https://api-ote.rrpproxy.net/'
         else:
             self.url = 'https://api.rrpproxy.net/'
         self.username = username
         self.password = password
 
+    def _build_url(
+            self,
+            command,
+            args,
+            session_id=None):
+        """
+        Build the URL for an API call.
+
+        Args:
+            command (str): The API command to call.
+            args (dict): Additional arguments to the API call.
+
+        Keyword Args:
+            session_id (str): Authenticate using a session instead of the
+                username and password.
+
+        Returns:
+            str: The URL.
+
+        """
+        (scheme, netloc, path, params, query, fragment) = parse.urlparse(
+            self.url)
+        path = '/api/call'
+
+        if session_id is None:
+            query = {
+                's_login': self.username,
+                's_pw': self.password,
+            }
+        else:
+            query = {
+                's_sessionid': session_id,
+            }
+        query['command'] = command
+        query.update(args)
+        query = parse.urlencode(query)
+        return parse.urlunparse((
+            scheme,
+            netloc,
+            path,
+            params,
+            query,
+            fragment))
+
     def _response_to_dict(self, response):
         """
         Convert a response to a dict.
@@ -62,33 +151,453 @@ class RRPproxy:
             dict: The response as a dict.
 
         """
-        # Cut off the EOF line.
-        response = response[:response.find('EOF', -10)]
-        parser = configparser.ConfigParser(
-            interpolation=None)
-        parser.read_string(response)
-        response = dict(parser.items('RESPONSE'))
-        for key in sorted(response):
-            if key.startswith('property['):
-                value = response.pop(key)
-                name_end_index = key.find(']', 9)
-                name = key[9:name_end_index]
-                index_start_index = key.find('[', name_end_index) + 1
-                index_end_index = key.find(']', index_start_index)
-                index = int(key[index_start_index:index_end_index])
-                properties = response.setdefault('properties', {})
-                properties.setdefault(name, []).append((value, index))
-        # Sort properties by index. This should preserve the indexes.
-        for name, values in response['properties'].items():
-            values = [
-                value for value, index
-                in sorted(values, key=lambda item: item[1])]
-            if len(values) == 1:
-                response['properties'][name] = values[0]
+        return parser.parse_response(response)
+
+
+class RRPproxy(BaseRRPproxy):
+    def __init__(
+            self,
+            username,
+            password,
+            test=False,
+            url=None,
+            pool_connections=10,
+            pool_maxsize=10,
+            pool_block=False,
+            timeout=None,
+            cache=None,
+            login_session=False,
+            rate_limiter=None,
+            coalesce=False,
+            timing_hooks=None,
+            transport=None,
+            post_threshold=POST_THRESHOLD,
+            zone_cache=None,
+            retries=0,
+            backoff=0.1,
+            max_backoff=2.0,
+            hedge_percentile=None,
+            hedge_budget=0.05):
+        """
+        The client keeps a pool of keep-alive connections to the API, so
+        consecutive calls reuse the same TCP and TLS connection. A single
+        client may be shared between threads; the underlying connection
+        pool is thread-safe. Call :meth:`close` (or use the client as a
+        context manager) to release the connections.
+
+        Args:
+            username (str): The RRP username.
+            password (str): The RRP password.
+
+        Keyword Args:
+            test (bool): Whether or not to use the test environment.
+            url (str): Override the API base URL (e.g. for a local
+                stand-in server).
+            pool_connections (int): The number of connection pools to
+                cache.
+            pool_maxsize (int): The maximum number of connections to keep
+                alive per pool. Set this to at least the number of threads
+                sharing the client.
+            pool_block (bool): Whether to block when no free connection is
+                available instead of opening a throwaway connection.
+            timeout (float): The connect and read timeout in seconds, a
+                `(connect, read)` tuple, or `None` to wait forever.
+            cache (TTLCache): A cache for responses to read-only commands,
+                or `None` to disable caching.
+            login_session (bool): Log in once using StartSession and
+                authenticate later calls with the session id instead of the
+                username and password. The session is renewed when it
+                expires and ended when the client is closed.
+            rate_limiter (RateLimiter): A rate limiter to take a token from
+                before every call. It may be shared between clients.
+                Throttled calls are retried at a decreased rate. Calls which
+                change something are only retried when they certainly
+                haven't run (HTTP 429).
+            coalesce (bool): Let identical concurrent read-only calls share
+                a single API call and response. The number of collapsed
+                calls is counted in `single_flight.collapsed`.
+            timing_hooks (list): Callables which are passed a
+                :class:`rrpproxypy.metrics.Timing` after every API call,
+                e.g. a :class:`rrpproxypy.metrics.Histograms`. Calls are
+                only timed when there are hooks.
+            transport: The transport to perform HTTP requests with, see
+                :mod:`rrpproxypy.transports`. Defaults to a pooled
+                :class:`requests.Session`, in which case the pool arguments
+                apply.
+            post_threshold (int): The URL length above which the arguments
+                are sent as a POST form body instead of a GET query, to stay
+                clear of URL length limits (e.g. for bulk commands with many
+                indexed arguments). `None` always uses GET.
+            zone_cache (ZoneInfoCache): A cache on disk for
+                :meth:`get_zone_info`, which may be shared between processes,
+                see :class:`rrpproxypy.zonecache.ZoneInfoCache`.
+            retries (int): The number of times a read-only call is retried
+                when it fails with a connection error, a timeout or a
+                temporary server error (code 421). Calls of other commands
+                are never retried, since they may have been applied.
+            backoff (float): The base wait before a retry in seconds. The
+                wait is random between zero and the base doubled for every
+                retry (full jitter).
+            max_backoff (float): The maximum wait before a retry in seconds.
+            hedge_percentile (float): Hedge read-only calls: when a call
+                takes longer than this percentile (e.g. `95`) of the recent
+                latencies, a second identical call is made and the first
+                successful response is used. The latencies of the last one
+                to two minutes are measured in `latencies` and the number of
+                hedged calls is counted in `hedged`.
+            hedge_budget (float): The maximum fraction of read-only calls
+                which are hedged.
+
+        """
+        super().__init__(
+            username,
+            password,
+            test=test,
+            url=url)
+        self.timeout = timeout
+        self.cache = cache
+        self.login_session = login_session
+        self.rate_limiter = rate_limiter
+        self.single_flight = singleflight.SingleFlight() if coalesce else None
+        self.timing_hooks = list(timing_hooks or [])
+        self.post_threshold = post_threshold
+        self.zone_cache = zone_cache
+        self.session_id = None
+        self._session_lock = threading.Lock()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.hedged = 0
+        self.latencies = metrics.WindowedHistogram()
+        self._hedge_calls = 0
+        self._hedge_lock = threading.Lock()
+        self._hedge_executor = None
+        # Two calls per thread sharing the client, so calls don't queue.
+        self._hedge_workers = 2 * pool_maxsize
+        if transport is None:
+            transport = transports.pooled_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block)
+        self.session = transport
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @classmethod
+    def from_args(
+            cls,
+            args,
+            **kwargs):
+        """
+        Create a client from parsed command line arguments.
+
+        Args:
+            args (Namespace): Arguments parsed by a parser set up using
+                :func:`rrpproxypy.add_arguments`.
+            **kwargs: Additional arguments to the client.
+
+        Returns:
+            RRPproxy: The client.
+
+        """
+        return cls(
+            args.rrpproxy_username,
+            args.rrpproxy_password,
+            test=args.rrpproxy_test,
+            **kwargs)
+
+    def close(self):
+        """
+        End the login session (if any) and close all pooled connections.
+
+        """
+        try:
+            self.end_session()
+        finally:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+            self.session.close()
+
+    def _authenticated_call(
+            self,
+            command,
+            args):
+        """
+        Call the API, using a login session when enabled.
+
+        Args:
+            command (str): The API command to call.
+            args (dict): Additional arguments to the API call.
+
+        Returns:
+            The parsed response.
+
+        """
+        if not self.login_session:
+            return self._call(command, args)
+        session_id = self.session_id or self.start_session()
+        response = self._call(command, args, session_id=session_id)
+        if int(response.get('code', 0)) in SESSION_EXPIRED_CODES:
+            session_id = self.start_session(expired=session_id)
+            response = self._call(command, args, session_id=session_id)
+        return response
+
+    def _call(
+            self,
+            command,
+            args,
+            session_id=None):
+        """
+        Call the API.
+
+        Args:
+            command (str): The API command to call.
+            args (dict): Additional arguments to the API call.
+
+        Keyword Args:
+            session_id (str): The session to authenticate with.
+
+        Returns:
+            The parsed response.
+
+        """
+        timed = bool(self.timing_hooks)
+        if timed:
+            started = time.perf_counter()
+        url = self._build_url(command, args, session_id=session_id)
+        post = (
+            self.post_threshold is not None and
+            len(url) > self.post_threshold)
+        if post:
+            url, _, body = url.partition('?')
+        if timed:
+            build = time.perf_counter() - started
+        limiter = self.rate_limiter
+        attempts = 1 if limiter is None else limiter.retries + 1
+        for attempt in range(attempts):
+            if limiter is not None:
+                limiter.acquire()
+            if timed:
+                sent = time.perf_counter()
+            if post:
+                http_response = self.session.post(
+                    url,
+                    data=body,
+                    headers=FORM_HEADERS,
+                    timeout=self.timeout)
+            else:
+                http_response = self.session.get(
+                    url,
+                    timeout=self.timeout)
+            text = http_response.text
+            if timed:
+                received = time.perf_counter()
+            response = self._response_to_dict(text)
+            if timed:
+                self._emit_timing(metrics.Timing(
+                    command,
+                    build,
+                    received - sent,
+                    time.perf_counter() - received,
+                    metrics.server_time(response, 'runtime'),
+                    metrics.server_time(response, 'queuetime')))
+                build = 0.0
+            if limiter is None:
+                break
+            if not limiter.is_throttled(http_response.status_code, response):
+                limiter.succeeded()
+                break
+            limiter.throttled()
+            # A 421 or an HTTP 503 doesn't tell whether the call has run, so
+            # only read-only calls are safe to send again.
+            if (command.lower() not in READ_ONLY_COMMANDS and
+                    http_response.status_code not in NOT_RUN_STATUS_CODES):
+                break
+        return response
+
+    def _emit_timing(self, timing):
+        """
+        Pass the timing of a call to all timing hooks.
+
+        Args:
+            timing (Timing): The timing.
+
+        """
+        for hook in self.timing_hooks:
+            hook(timing)
+
+    def _hedged_call(
+            self,
+            command,
+            args):
+        """
+        Call the API, making a second call when the first is slow.
+
+        Both calls are made in worker threads. When the first call takes
+        longer than the hedge percentile of the recent latencies and the
+        hedge budget allows, a second identical call is made. The delay is
+        measured from when the first call starts, so waiting for a worker
+        doesn't trigger a hedge. The call which is still running when the
+        other succeeds completes in the background.
+
+        Returns:
+            The parsed response of the call which succeeds first.
+
+        """
+        with self._hedge_lock:
+            self._hedge_calls += 1
+            delay = None
+            if self.latencies.count >= HEDGE_MIN_SAMPLES:
+                delay = self.latencies.percentile(self.hedge_percentile)
+            if delay is not None and self._hedge_executor is None:
+                self._hedge_executor = futures.ThreadPoolExecutor(
+                    max_workers=self._hedge_workers)
+        if delay is None:
+            return self._timed_call(command, args)
+        started = threading.Event()
+
+        def first():
+            started.set()
+            return self._timed_call(command, args)
+
+        calls = [self._hedge_executor.submit(first)]
+        started.wait()
+        done, _ = futures.wait(calls, timeout=delay)
+        if not done:
+            with self._hedge_lock:
+                hedge = self.hedged < self.hedge_budget * self._hedge_calls
+                if hedge:
+                    self.hedged += 1
+            if hedge:
+                calls.append(self._hedge_executor.submit(
+                    self._timed_call,
+                    command,
+                    args))
+        pending = calls
+        while pending:
+            done, pending = futures.wait(
+                pending,
+                return_when=futures.FIRST_COMPLETED)
+            for call in done:
+                if call.exception() is None:
+                    return call.result()
+        # All calls have failed.
+        return calls[0].result()
+
+    def _read_call(
+            self,
+            command,
+            args):
+        """
+        Call a read-only command, with retries and hedging when enabled.
+
+        Returns:
+            The parsed response.
+
+        """
+        attempt = 0
+        while True:
+            try:
+                if self.hedge_percentile is None:
+                    response = self._authenticated_call(command, args)
+                else:
+                    response = self._hedged_call(command, args)
+            except OSError:
+                # Connection errors and timeouts, including those of
+                # requests.
+                if attempt >= self.retries:
+                    raise
             else:
-                response['properties'][name] = values
+                if (attempt >= self.retries or
+                        int(response.get('code', 0)) not in RETRY_CODES):
+                    return response
+            time.sleep(random.uniform(
+                0,
+                min(self.max_backoff, self.backoff * 2 ** attempt)))
+            attempt += 1
+
+    def _timed_call(
+            self,
+            command,
+            args):
+        """
+        Call the API, measuring the latency of successful calls.
+
+        Returns:
+            The parsed response.
+
+        """
+        started = time.perf_counter()
+        response = self._authenticated_call(command, args)
+        latency = time.perf_counter() - started
+        with self._hedge_lock:
+            self.latencies.add(latency)
         return response
 
+    def check_domains(
+            self,
+            domains,
+            workers=10,
+            chunk_size=MAX_CHECK_DOMAINS,
+            target_runtime=1.0):
+        """
+        Check the availability of many domains.
+
+        The domains are packed into CheckDomains calls of up to `chunk_size`
+        domains each (as `domain0`, `domain1`, ...), which are made
+        concurrently. The chunk size shrinks when the server takes longer
+        than `target_runtime` for a call, and grows back when it is fast.
+
+        Args:
+            domains (iterable): The domain names.
+
+        Keyword Args:
+            workers (int): The number of concurrent calls.
+            chunk_size (int): The maximum number of domains per call.
+            target_runtime (float): The server runtime to aim for per call,
+                in seconds.
+
+        Yields:
+            Result: The result for every domain, the input being the domain
+                name and the response a :class:`rrpproxypy.parser.Record`
+                of the properties for the domain (e.g. `domaincheck`). When
+                a call fails, the error is set for all its domains.
+
+        Note:
+            See the wiki for more info:
+            https://wiki.rrpproxy.net/api/api-command/CheckDomains
+
+        """
+        sizer = bulk.ChunkSizer(chunk_size, target_runtime=target_runtime)
+
+        def check(chunk):
+            response = self.request(
+                'CheckDomains',
+                **{
+                    'domain{}'.format(index): domain
+                    for index, domain in enumerate(chunk)})
+            sizer.observe(len(chunk), float(response.get('runtime') or 0))
+            if int(response['code']) != 200:
+                raise exceptions.Failure(response['description'])
+            return response.rows()
+
+        chunks = bulk.chunked(domains, lambda: sizer.size)
+        for result in bulk.fan_out(check, chunks, workers=workers):
+            for index, domain in enumerate(result.input):
+                if result.error is not None:
+                    yield bulk.Result(domain, None, result.error)
+                elif index < len(result.response):
+                    yield bulk.Result(domain, result.response[index], None)
+                else:
+                    yield bulk.Result(domain, None, exceptions.Failure(
+                        'No result for {}'.format(domain)))
+
     def convert_currency(
             self,
             amount,
@@ -157,6 +666,9 @@ class RRPproxy:
         """
         Get information about a zone (TLD).
 
+        When the client has a `zone_cache` and there are no additional
+        params, the cached information is used while it is fresh.
+
         Args:
             zone (str): The zone to query.
             **params: Additional params.
@@ -169,12 +681,83 @@ class RRPproxy:
             https://wiki.rrpproxy.net/api/api-command/GetZoneInfo
 
         """
+        if self.zone_cache is not None and not params:
+            return self.zone_cache.get(self, zone)
         response = self.request(
             'GetZoneInfo',
             zone=zone,
             **params)
         return response
 
+    def iter_domains(
+            self,
+            page_size=1000,
+            typed=False,
+            **filters):
+        """
+        Iterate over all domains, one page at a time.
+
+        The domains are fetched with QueryDomainList using `first` and
+        `limit`. The next page is fetched in the background while the
+        current page is consumed, so at most two pages are in memory at any
+        time.
+
+        Args:
+            page_size (int): The number of domains to fetch per call.
+            typed (bool): Decode dates, numbers and amounts, see
+                :mod:`rrpproxypy.fields`. Values are only decoded when they
+                are read.
+            **filters: Additional params to QueryDomainList, e.g. `zone`.
+                Domains are ordered by expiration date by default.
+
+        Yields:
+            Record: Every domain, mapping column names to values. Typed
+                domains are :class:`rrpproxypy.fields.RowView` instances.
+
+        Raises:
+            Failure: When fetching a page has failed.
+
+        Note:
+            See the wiki for more info:
+            https://wiki.rrpproxy.net/api/api-command/QueryDomainList
+
+        """
+        filters.setdefault('orderby', 'DOMAINREGISTRATIONEXPIRATIONDATE')
+
+        def fetch(first):
+            response = self.request(
+                'QueryDomainList',
+                wide=1,
+                first=first,
+                limit=page_size,
+                **filters)
+            if int(response['code']) != 200:
+                raise exceptions.Failure(response['description'])
+            return response
+
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            first = 0
+            page = executor.submit(fetch, first)
+            while page is not None:
+                response = page.result()
+                properties = response.get('properties', {})
+                count = int(properties.get('count', 0))
+                first += count
+                total = int(properties.get('total', first))
+                # The API may return fewer domains than the page size,
+                # e.g. when it caps the limit, so only the total counts.
+                if count > 0 and first < total:
+                    page = executor.submit(fetch, first)
+                else:
+                    page = None
+                if typed:
+                    response = fields.decode(response)
+                rows = response.rows(
+                    parser.as_list(properties.get('column', [])))
+                # Release the page before waiting for the next one.
+                del response, properties
+                yield from rows
+
     def query_domain_list(self):
         """
         Query a list of domains.
@@ -219,28 +802,96 @@ class RRPproxy:
             The parsed response.
 
         """
-        (scheme, netloc, path, params, query, fragment) = parse.urlparse(
-            self.url)
-        path = '/api/call'
-
-        query = {
-            's_login': self.username,
-            's_pw': self.password,
-            'command': command,
-        }
-        query.update(args)
-        query = parse.urlencode(query)
-        url = parse.urlunparse((
-            scheme,
-            netloc,
-            path,
-            params,
-            query,
-            fragment))
-        response = requests.get(url)
-        response = self._response_to_dict(response.text)
+        read_only = command.lower() in READ_ONLY_COMMANDS
+        cached = (
+            read_only and
+            self.cache is not None and
+            self.cache.cacheable(command))
+        scope = (self.url, self.username)
+        if cached:
+            response = self.cache.get(command, args, scope=scope)
+            if response is not None:
+                return response
+        if self.single_flight is not None and read_only:
+            response = self.single_flight.do(
+                cache.make_key(command, args),
+                lambda: self._read_call(command, args))
+        elif read_only:
+            response = self._read_call(command, args)
+        else:
+            response = self._authenticated_call(command, args)
+        if cached and response.get('code', '').startswith('2'):
+            self.cache.set(command, args, response, scope=scope)
         return response
 
+    def request_many(
+            self,
+            commands,
+            workers=10):
+        """
+        Perform many requests concurrently.
+
+        The requests are spread over a pool of worker threads. Results are
+        yielded as they complete; each result holds the command it belongs
+        to. A failing request doesn't abort the others, its exception is
+        stored on the result instead. Make sure `pool_maxsize` is at least
+        the number of workers, otherwise connections are not reused.
+
+        Args:
+            commands (iterable): Pairs of the API command and a dict of
+                arguments, e.g. `('StatusDomain', {'domain': 'a.com'})`.
+
+        Keyword Args:
+            workers (int): The number of concurrent requests.
+
+        Yields:
+            Result: The result for every command.
+
+        """
+        return bulk.fan_out(
+            lambda item: self.request(item[0], **item[1]),
+            commands,
+            workers=workers)
+
+    def start_session(
+            self,
+            expired=None):
+        """
+        Start a login session.
+
+        When several threads notice that the same session has expired,
+        only one of them starts a new session.
+
+        Keyword Args:
+            expired (str): The session id which has expired. A new session
+                is only started when it is still the current session.
+
+        Returns:
+            str: The session id.
+
+        Raises:
+            Failure: When the session could not be started.
+
+        """
+        with self._session_lock:
+            if self.session_id is not None and self.session_id != expired:
+                return self.session_id
+            response = self._call('StartSession', {})
+            if int(response['code']) != 200:
+                raise exceptions.Failure(response['description'])
+            self.session_id = response['properties']['sessionid']
+            return self.session_id
+
+    def end_session(self):
+        """
+        End the login session, if any.
+
+        """
+        with self._session_lock:
+            session_id, self.session_id = self.session_id, None
+        if session_id is not None:
+            self._call('EndSession', {}, session_id=session_id)
+
     def status_domain(self, domain):
         """
         Request the domain status.
@@ -256,3 +907,88 @@ class RRPproxy:
             'StatusDomain',
             domain=domain)
         return response
+
+    def status_domains(
+            self,
+            domains,
+            workers=10):
+        """
+        Request the status of many domains concurrently.
+
+        See :meth:`request_many`.
+
+        Args:
+            domains (iterable): The domain names.
+
+        Keyword Args:
+            workers (int): The number of concurrent requests.
+
+        Yields:
+            Result: The result for every domain, the input being the domain
+                name.
+
+        """
+        return bulk.fan_out(
+            self.status_domain,
+            domains,
+            workers=workers)
+
+    def stream(
+            self,
+            command,
+            columns=None,
+            **args):
+        """
+        Perform a request, yielding the rows of the response as they arrive.
+
+        The response is read and parsed incrementally instead of as a whole,
+        so rows can be consumed while the response is still downloading and
+        the full response text is never held in memory. See
+        :class:`rrpproxypy.parser.RowStream`. Streamed calls are not cached,
+        coalesced, timed or retried.
+
+        Args:
+            command (str): The API command to call, e.g. QueryDomainList.
+            columns (list): The names of the columns. Defaults to the
+                `column` property of the response.
+
+        Keyword Args:
+            Additional arguments to the API call.
+
+        Yields:
+            Record: Every row of the response.
+
+        Raises:
+            Failure: When the call has failed, after all rows have been
+                yielded.
+
+        """
+        session_id = None
+        if self.login_session:
+            session_id = self.session_id or self.start_session()
+        url = self._build_url(command, args, session_id=session_id)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        http_response = self.session.get(
+            url,
+            timeout=self.timeout,
+            stream=True)
+        try:
+            if hasattr(http_response, 'iter_lines'):
+                if http_response.encoding is None:
+                    http_response.encoding = 'utf-8'
+                lines = http_response.iter_lines(
+                    chunk_size=STREAM_CHUNK_SIZE,
+                    decode_unicode=True)
+            else:
+                # The transport doesn't stream, e.g. a replay.
+                lines = http_response.text.splitlines()
+            rows = parser.RowStream(lines, columns=columns)
+            yield from rows
+        finally:
+            close = getattr(http_response, 'close', None)
+            if close is not None:
+                close()
+        response = rows.response
+        if int(response.get('code', 0)) != 200:
+            raise exceptions.Failure(response.get('description'))
@@ -0,0 +1,205 @@
+from decimal import Decimal
+import decimal
+import threading
+import time
+
+from rrpproxypy import exceptions
+
+
+class CurrencyConverter:
+    def __init__(
+            self,
+            client,
+            max_age=3600,
+            places=Decimal('0.01'),
+            clock=time.monotonic):
+        """
+        Convert amounts locally using the exchange rates of the API.
+
+        The rate table is loaded with QueryExchangeRates on first use and
+        reloaded once it is older than `max_age`. Conversions between
+        currencies that aren't in the table are done by the API using
+        ConvertCurrency.
+
+        Args:
+            client (RRPproxy): The client to load the rates with.
+
+        Keyword Args:
+            max_age (float): The number of seconds after which the rates
+                are reloaded.
+            places (Decimal): The precision to round converted amounts to.
+            clock (callable): The clock to measure the age with.
+
+        """
+        self.client = client
+        self.max_age = max_age
+        self.places = places
+        self.clock = clock
+        self.base = None
+        self.rates = {}
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """
+        Load the rate table unless it is still fresh.
+
+        Returns:
+            dict: The rates from the base currency by currency.
+
+        """
+        with self._lock:
+            if (self._loaded is None or
+                    self.clock() - self._loaded >= self.max_age):
+                self.refresh()
+            return self.rates
+
+    def refresh(self):
+        """
+        Reload the rate table from the API.
+
+        Only rates from the first base currency are used; the API quotes
+        all rates from EUR.
+
+        Raises:
+            Failure: When the rates could not be loaded.
+
+        """
+        response = self.client.query_exchange_rates()
+        if int(response['code']) != 200:
+            raise exceptions.Failure(response['description'])
+        rows = response.rows(['currency from', 'currency to', 'rate'])
+        base = rows[0]['currency from'] if rows else None
+        rates = {base: Decimal(1)}
+        for row in rows:
+            if row['currency from'] == base:
+                rates[row['currency to']] = Decimal(row['rate'])
+        self.base = base
+        self.rates = rates
+        self._loaded = self.clock()
+
+    def rate(
+            self,
+            from_,
+            to):
+        """
+        Get the exchange rate between two currencies.
+
+        Args:
+            from_ (str): The currency from which to convert.
+            to (str): The currency to which to convert.
+
+        Returns:
+            Decimal: The rate, or `None` when a currency is unknown.
+
+        """
+        rates = self._load()
+        try:
+            return rates[to] / rates[from_]
+        except KeyError:
+            return None
+
+    def convert(
+            self,
+            amount,
+            from_,
+            to,
+            verify=False):
+        """
+        Convert an amount.
+
+        Args:
+            amount (Decimal): The amount to convert.
+            from_ (str): The currency from which to convert.
+            to (str): The currency to which to convert.
+
+        Keyword Args:
+            verify (bool): Also convert using the API and check whether
+                both amounts are equal.
+
+        Returns:
+            Decimal: The converted amount.
+
+        Raises:
+            Failure: When the API conversion has failed.
+            ConversionMismatch: When verifying and the amounts differ.
+
+        """
+        return self.convert_many(
+            [amount],
+            from_,
+            to,
+            verify=verify)[0]
+
+    def convert_many(
+            self,
+            amounts,
+            from_,
+            to,
+            verify=False):
+        """
+        Convert a list of amounts, e.g. a price list.
+
+        All amounts are converted using the same rate, so a whole list
+        costs at most one API call to refresh the rates.
+
+        Args:
+            amounts (iterable): The amounts to convert.
+            from_ (str): The currency from which to convert.
+            to (str): The currency to which to convert.
+
+        Keyword Args:
+            verify (bool): Also convert every amount using the API and
+                check whether the amounts are equal.
+
+        Returns:
+            list: The converted amounts as Decimals.
+
+        Raises:
+            Failure: When the API conversion has failed.
+            ConversionMismatch: When verifying and the amounts differ.
+
+        """
+        rate = self.rate(from_, to)
+        converted = []
+        for amount in amounts:
+            if rate is None:
+                converted.append(self.convert_remote(amount, from_, to))
+                continue
+            local = (Decimal(amount) * rate).quantize(
+                self.places,
+                rounding=decimal.ROUND_HALF_UP)
+            if verify:
+                remote = self.convert_remote(amount, from_, to)
+                if local != remote:
+                    raise exceptions.ConversionMismatch(
+                        'Converted {} {} to {} {} locally, but to {} {} '
+                        'by the API'.format(
+                            amount, from_, local, to, remote, to))
+            converted.append(local)
+        return converted
+
+    def convert_remote(
+            self,
+            amount,
+            from_,
+            to):
+        """
+        Convert an amount using the API.
+
+        Args:
+            amount (Decimal): The amount to convert.
+            from_ (str): The currency from which to convert.
+            to (str): The currency to which to convert.
+
+        Returns:
+            Decimal: The converted amount.
+
+        Raises:
+            Failure: When the conversion has failed.
+
+        """
+        response = self.client.convert_currency(amount, from_, to)
+        if int(response['code']) != 200:
+            raise exceptions.Failure(response['description'])
+        return Decimal(response['properties']['converted amount'])
@@ -1,2 +1,10 @@
 class Failure(Exception):
     pass
+
+
+class ConversionMismatch(Failure):
+    pass
+
+
+class NotRecorded(LookupError):
+    pass
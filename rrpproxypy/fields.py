@@ -0,0 +1,293 @@
+from collections import abc
+from decimal import Decimal
+import datetime
+
+from rrpproxypy import parser
+
+
+# Property and response fields by type, in lower case. Fields ending in
+# ` date` are datetimes.
+INT_FIELDS = frozenset([
+    'code',
+    'count',
+    'first',
+    'last',
+    'limit',
+    'period',
+    'total',
+])
+FLOAT_FIELDS = frozenset([
+    'queuetime',
+    'runtime',
+])
+MONEY_FIELDS = frozenset([
+    'amount',
+    'annual',
+    'application',
+    'converted amount',
+    'exchangerate',
+    'nonrefundable',
+    'price',
+    'rate',
+    'restore',
+    'setup',
+    'trade',
+    'transfer',
+    'vat',
+    'vatnonrefundable',
+])
+
+_MISSING = object()
+
+
+def parse_datetime(value):
+    """
+    Parse a datetime in the API format (`YYYY-MM-DD HH:MM:SS`).
+
+    The fixed format is parsed by slicing, which is many times faster than
+    :func:`datetime.datetime.strptime`.
+
+    Args:
+        value (str): The value to parse.
+
+    Returns:
+        The datetime, or the value itself when it isn't a datetime.
+
+    """
+    if (len(value) == 19 and value[4] == '-' and value[7] == '-' and
+            value[10] == ' ' and value[13] == ':' and value[16] == ':'):
+        try:
+            return datetime.datetime(
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]))
+        except ValueError:
+            pass
+    return value
+
+
+def _tolerant(convert):
+    """
+    Make a decoder which returns the value itself when it can't convert it.
+
+    """
+    def decode(value):
+        try:
+            return convert(value)
+        except (ValueError, ArithmeticError):
+            return value
+    return decode
+
+
+_decode_int = _tolerant(int)
+_decode_float = _tolerant(float)
+_decode_money = _tolerant(Decimal)
+
+
+def decoder_for(name):
+    """
+    Get the decoder for a field.
+
+    Args:
+        name (str): The lower case field name.
+
+    Returns:
+        callable: The decoder, or `None` when the field is a string.
+
+    """
+    if name.endswith(' date'):
+        return parse_datetime
+    if name in INT_FIELDS:
+        return _decode_int
+    if name in FLOAT_FIELDS:
+        return _decode_float
+    if name in MONEY_FIELDS:
+        return _decode_money
+    return None
+
+
+class LazyList(abc.Sequence):
+    """
+    A list of values which are decoded when they are accessed.
+
+    Args:
+        values (list): The raw values.
+        decoder (callable): The decoder.
+
+    """
+    __slots__ = ('_values', '_decoder', '_decoded')
+
+    def __init__(
+            self,
+            values,
+            decoder):
+        self._values = values
+        self._decoder = decoder
+        self._decoded = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if self._decoded is None:
+            self._decoded = [_MISSING] * len(self._values)
+        value = self._decoded[index]
+        if value is _MISSING:
+            value = self._decoded[index] = self._decoder(self._values[index])
+        return value
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _LazyMapping(abc.Mapping):
+    """
+    A mapping of which the values are decoded when they are accessed.
+
+    """
+    def __init__(self, values):
+        self._values = values
+        self._decoded = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._decoded[name]
+        except KeyError:
+            pass
+        value = self._decode(name, self._values[name])
+        self._decoded[name] = value
+        return value
+
+    def _decode(
+            self,
+            name,
+            value):
+        decoder = decoder_for(name)
+        if decoder is None:
+            return value
+        if isinstance(value, list):
+            return LazyList(value, decoder)
+        return decoder(value)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self))
+
+
+class TypedResponse(_LazyMapping):
+    """
+    A response of which the values are decoded when they are accessed.
+
+    Dates become datetimes, codes and counts integers and amounts Decimals.
+    Decoded values are memoized. Values which can't be decoded are left as
+    they are.
+
+    Args:
+        response (Response): The parsed response.
+
+    """
+    def _decode(
+            self,
+            name,
+            value):
+        if name == 'properties':
+            return _LazyMapping(value)
+        return super()._decode(name, value)
+
+    def rows(self, columns=None):
+        """
+        Get a row view of the properties.
+
+        Only the values which are read are decoded.
+
+        Keyword Args:
+            columns (list): See :meth:`rrpproxypy.parser.Response.rows`.
+
+        Returns:
+            TypedRows: The rows, a sequence of :class:`RowView`.
+
+        """
+        properties = self.get('properties', {})
+        if columns is None:
+            if 'column' in properties:
+                columns = parser.as_list(properties['column'])
+            else:
+                columns = list(properties)
+        return TypedRows(properties, columns)
+
+
+class RowView(abc.Mapping):
+    """
+    A row of a typed list response, decoding values when accessed.
+
+    Args:
+        rows (TypedRows): The rows.
+        index (int): The index of the row.
+
+    """
+    __slots__ = ('_rows', '_index')
+
+    def __init__(
+            self,
+            rows,
+            index):
+        self._rows = rows
+        self._index = index
+
+    def __getitem__(self, name):
+        values = self._rows._values[self._rows.columns[name]]
+        if self._index < len(values):
+            return values[self._index]
+        return None
+
+    def __iter__(self):
+        return iter(self._rows.columns)
+
+    def __len__(self):
+        return len(self._rows.columns)
+
+    def __repr__(self):
+        return 'RowView({!r})'.format(dict(self))
+
+
+class TypedRows(parser.Rows):
+    """
+    A lazy row view of a typed list response.
+
+    """
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('row index out of range')
+        return RowView(self, index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield RowView(self, index)
+
+
+def decode(response):
+    """
+    Decode a response lazily.
+
+    Args:
+        response (Response): The parsed response.
+
+    Returns:
+        TypedResponse: The typed response.
+
+    """
+    return TypedResponse(response)
@@ -0,0 +1,269 @@
+import collections
+import math
+import threading
+import time
+
+
+Timing = collections.namedtuple(
+    'Timing',
+    [
+        'command',
+        'build',
+        'http',
+        'parse',
+        'runtime',
+        'queuetime',
+    ])
+Timing.__doc__ = """
+The timing of a single API call. All times are in seconds.
+
+Attributes:
+    command (str): The API command.
+    build (float): The time spent building the URL.
+    http (float): The time spent on the HTTP request, including reading
+        the response body.
+    parse (float): The time spent parsing the response.
+    runtime (float): The runtime reported by the API, or `None`.
+    queuetime (float): The queue time reported by the API, or `None`.
+
+"""
+
+PHASES = ('build', 'http', 'parse', 'runtime', 'queuetime')
+
+
+def server_time(response, name):
+    """
+    Get a time reported by the API.
+
+    Args:
+        response (dict): The parsed response.
+        name (str): The name, `runtime` or `queuetime`.
+
+    Returns:
+        float: The time, or `None` when it isn't reported.
+
+    """
+    try:
+        return float(response[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class Histogram:
+    def __init__(
+            self,
+            growth=1.02,
+            minimum=1e-6):
+        """
+        A histogram with logarithmic buckets.
+
+        Every bucket is `growth` times as wide as the previous one, so
+        percentiles have a relative error of at most `growth - 1` while the
+        memory use is bounded by the range of the values, not their number.
+
+        Keyword Args:
+            growth (float): The ratio between two bucket boundaries.
+            minimum (float): The upper boundary of the first bucket.
+
+        """
+        self.growth = growth
+        self.minimum = minimum
+        self.buckets = collections.Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._log_growth = math.log(growth)
+
+    def add(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): The value.
+
+        """
+        if value <= self.minimum:
+            index = 0
+        else:
+            index = int(math.log(value / self.minimum) / self._log_growth) + 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile):
+        """
+        Estimate a percentile.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The estimated value, or `None` without values.
+
+        """
+        if not self.count:
+            return None
+        rank = percentile / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                break
+        if index == 0:
+            return min(self.minimum, self.max)
+        # The geometric middle of the bucket.
+        value = self.minimum * self.growth ** (index - 0.5)
+        return min(value, self.max)
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        Summarize the values.
+
+        Keyword Args:
+            percentiles (iterable): The percentiles to include.
+
+        Returns:
+            dict: The count, mean, maximum and percentiles (as `p50` etc.).
+
+        """
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max,
+        }
+        for percentile in percentiles:
+            summary['p{:g}'.format(percentile)] = self.percentile(percentile)
+        return summary
+
+
+class WindowedHistogram:
+    def __init__(
+            self,
+            window=60.0,
+            clock=time.monotonic,
+            **kwargs):
+        """
+        A histogram of recent values.
+
+        Values are kept in a histogram per window of time. Percentiles are
+        estimated from the current and the previous window, so they reflect
+        the values of the last one to two windows.
+
+        Keyword Args:
+            window (float): The length of a window in seconds.
+            clock (callable): A monotonic clock.
+            **kwargs: Arguments to the :class:`Histogram` of every window.
+
+        """
+        self.window = window
+        self.clock = clock
+        self.kwargs = kwargs
+        self._current = Histogram(**kwargs)
+        self._previous = Histogram(**kwargs)
+        self._started = clock()
+
+    def _rotate(self):
+        """
+        Start a new window when the current one has passed.
+
+        """
+        elapsed = self.clock() - self._started
+        if elapsed < self.window:
+            return
+        if elapsed < 2 * self.window:
+            self._previous = self._current
+        else:
+            self._previous = Histogram(**self.kwargs)
+        self._current = Histogram(**self.kwargs)
+        self._started += elapsed // self.window * self.window
+
+    @property
+    def count(self):
+        """
+        int: The number of recent values.
+
+        """
+        self._rotate()
+        return self._previous.count + self._current.count
+
+    def add(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): The value.
+
+        """
+        self._rotate()
+        self._current.add(value)
+
+    def percentile(self, percentile):
+        """
+        Estimate a percentile of the recent values.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The estimated value, or `None` without values.
+
+        """
+        self._rotate()
+        merged = Histogram(**self.kwargs)
+        for histogram in (self._previous, self._current):
+            merged.buckets.update(histogram.buckets)
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.max = max(merged.max, histogram.max)
+        return merged.percentile(percentile)
+
+
+class Histograms:
+    def __init__(self, **kwargs):
+        """
+        A timing hook aggregating timings per command and phase.
+
+        Pass an instance in the `timing_hooks` of a client. It is safe to
+        share between threads and clients.
+
+        Keyword Args:
+            **kwargs: Arguments to every :class:`Histogram`.
+
+        """
+        self.kwargs = kwargs
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timing):
+        with self._lock:
+            for phase in PHASES:
+                value = getattr(timing, phase)
+                if value is None:
+                    continue
+                key = (timing.command, phase)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(
+                        **self.kwargs)
+                histogram.add(value)
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        Summarize all timings.
+
+        Keyword Args:
+            percentiles (iterable): The percentiles to include.
+
+        Returns:
+            dict: The summary of every phase by command, see
+                :meth:`Histogram.summary`.
+
+        """
+        summary = {}
+        with self._lock:
+            for (command, phase), histogram in sorted(
+                    self.histograms.items()):
+                summary.setdefault(command, {})[phase] = histogram.summary(
+                    percentiles)
+        return summary
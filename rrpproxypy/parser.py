@@ -0,0 +1,319 @@
+from collections import abc
+import itertools
+import re
+
+
+# A property line, `property[name][index] = value`. Like configparser, the
+# first `=` or `:` is the delimiter.
+PROPERTY = re.compile(
+    r'property\[([^\]=:]*)\]\[(\d+)\][^=:]*[=:]\s*(.*)',
+    re.IGNORECASE)
+
+
+def as_list(value):
+    """
+    Get the values of a property as a list.
+
+    Properties with a single index are parsed as a plain value; this undoes
+    that for properties which are lists by nature.
+
+    Args:
+        value: The property value, a list (or another sequence) or a single
+            value.
+
+    Returns:
+        list: The values.
+
+    """
+    if isinstance(value, abc.Sequence) and not isinstance(value, str):
+        return value
+    return [value]
+
+
+class Record(abc.Mapping):
+    """
+    A compact, read-only row of a list response.
+
+    A record maps column names to values like a dict, but only holds a
+    tuple of values. The column names are shared between all records of a
+    response.
+
+    Args:
+        columns (dict): The column positions by name.
+        values (tuple): The values in column order.
+
+    """
+    __slots__ = ('_columns', '_values')
+
+    def __init__(
+            self,
+            columns,
+            values):
+        self._columns = columns
+        self._values = values
+
+    def __getitem__(self, name):
+        return self._values[self._columns[name]]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __repr__(self):
+        return 'Record({!r})'.format(dict(self))
+
+
+class Rows(abc.Sequence):
+    """
+    A lazy row view of the parallel property lists of a list response.
+
+    Records are only created when they are accessed.
+
+    Args:
+        properties (dict): The response properties.
+        columns (list): The names of the columns.
+
+    """
+    def __init__(
+            self,
+            properties,
+            columns):
+        self.columns = {
+            name: position for position, name in enumerate(columns)}
+        self._values = [
+            as_list(properties.get(name, [])) for name in columns]
+        self._length = max(map(len, self._values), default=0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('row index out of range')
+        return Record(self.columns, tuple(
+            values[index] if index < len(values) else None
+            for values in self._values))
+
+    def __iter__(self):
+        columns = self.columns
+        for values in itertools.zip_longest(*self._values):
+            yield Record(columns, values)
+
+    def __len__(self):
+        return self._length
+
+
+class Response(dict):
+    """
+    A parsed response.
+
+    The response is a plain dict; list responses can additionally be read
+    row by row using :meth:`rows`.
+
+    """
+    def rows(self, columns=None):
+        """
+        Get a row view of the properties.
+
+        Keyword Args:
+            columns (list): The properties to use as columns. Defaults to
+                the `column` property when the response has one (as
+                QueryDomainList has) and to all properties otherwise.
+
+        Returns:
+            Rows: The rows, a sequence of :class:`Record`.
+
+        """
+        properties = self.get('properties', {})
+        if columns is None:
+            if 'column' in properties:
+                columns = as_list(properties['column'])
+            else:
+                columns = list(properties)
+        return Rows(properties, columns)
+
+
+def _parse_key(
+        line,
+        response):
+    """
+    Parse a `key = value` line of a response into the response.
+
+    """
+    delimiter = min(
+        (index for index in (line.find('='), line.find(':'))
+         if index >= 0),
+        default=None)
+    if delimiter is not None:
+        key = line[:delimiter].rstrip().lower()
+        response[key] = line[delimiter + 1:].strip()
+
+
+def parse_response(text):
+    """
+    Parse the text of an RRP response.
+
+    The response is parsed in a single pass. Every `property[name][index]`
+    value is placed directly in its slot. Properties are converted to lists
+    whenever there are multiple indexes for the same property; a property
+    with a single index becomes a plain value. Property and key names are
+    lower cased.
+
+    Args:
+        text (str): The response text.
+
+    Returns:
+        Response: The response as a dict.
+
+    """
+    response = Response()
+    properties = {}
+    # Properties with indexes out of order, by name and index.
+    irregular = {}
+    in_response = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line[0] == '[' and line[-1] == ']':
+            in_response = line == '[RESPONSE]'
+            continue
+        if line == 'EOF':
+            break
+        if not in_response:
+            continue
+        match = PROPERTY.match(line)
+        if match is None:
+            _parse_key(line, response)
+            continue
+        name, index, value = match.groups()
+        name = name.lower()
+        index = int(index)
+        if name in irregular:
+            irregular[name][index] = value
+            continue
+        values = properties.get(name)
+        if values is None:
+            values = properties[name] = []
+        if index == len(values):
+            values.append(value)
+        else:
+            irregular[name] = dict(enumerate(values))
+            irregular[name][index] = value
+    # Sort properties by index. Gaps in the indexes are closed.
+    for name, values in irregular.items():
+        properties[name] = [values[index] for index in sorted(values)]
+    for name, values in properties.items():
+        if len(values) == 1:
+            properties[name] = values[0]
+    if properties:
+        response['properties'] = properties
+    return response
+
+
+class RowStream:
+    """
+    Parse a list response line by line, yielding rows as they complete.
+
+    Rows are yielded as soon as all of their columns have been parsed, so
+    the rows of a response that is still being downloaded can already be
+    consumed, and only incomplete rows are held in memory. When properties
+    are sent column by column, rows complete while the last column is
+    parsed; when they are sent row by row, every row completes right away.
+
+    The columns are taken from the `column` property when it precedes the
+    column values (as it does for QueryDomainList), otherwise the rows are
+    yielded like :meth:`Response.rows` once the response has been parsed.
+
+    Args:
+        lines (iterable): The lines of the response text.
+
+    Keyword Args:
+        columns (list): The names of the columns, instead of the `column`
+            property.
+
+    Attributes:
+        response (Response): The response, without the column values. It is
+            complete once all rows have been consumed.
+
+    """
+    def __init__(
+            self,
+            lines,
+            columns=None):
+        self.response = Response()
+        self._lines = lines
+        self._columns = columns
+
+    def __iter__(self):
+        response = self.response
+        # Property values by name and index, other than column values.
+        properties = {}
+        # Column values by column and index, until their row completes.
+        values = None
+        columns = None
+        if self._columns is not None:
+            columns = list(self._columns)
+            values = {name: {} for name in columns}
+        positions = None
+        next_row = 0
+        last_row = -1
+        in_response = False
+        for line in self._lines:
+            line = line.strip()
+            if not line or line[0] in '#;':
+                continue
+            if line[0] == '[' and line[-1] == ']':
+                in_response = line == '[RESPONSE]'
+                continue
+            if line == 'EOF':
+                break
+            if not in_response:
+                continue
+            match = PROPERTY.match(line)
+            if match is None:
+                _parse_key(line, response)
+                continue
+            name, index, value = match.groups()
+            name = name.lower()
+            index = int(index)
+            if (values is None and name != 'column' and
+                    'column' in properties):
+                column = properties['column']
+                columns = [column[i] for i in sorted(column)]
+                values = {name: {} for name in columns}
+            if values is None or name not in values:
+                properties.setdefault(name, {})[index] = value
+                continue
+            if positions is None:
+                positions = {
+                    name: position for position, name in enumerate(columns)}
+            values[name][index] = value
+            if index > last_row:
+                last_row = index
+            # Only a value of the next row can complete it (and the rows
+            # after it which were already complete).
+            if index != next_row:
+                continue
+            while next_row <= last_row and all(
+                    next_row in indexes for indexes in values.values()):
+                yield Record(positions, tuple(
+                    values[name].pop(next_row) for name in columns))
+                next_row += 1
+        # Rows with missing values are yielded last, like zip_longest.
+        if positions is not None:
+            for row in range(next_row, last_row + 1):
+                yield Record(positions, tuple(
+                    values[name].pop(row, None) for name in columns))
+        for name, indexes in properties.items():
+            if len(indexes) == 1:
+                properties[name], = indexes.values()
+            else:
+                properties[name] = [indexes[i] for i in sorted(indexes)]
+        if properties:
+            response['properties'] = properties
+        if positions is None and properties:
+            yield from response.rows(columns)
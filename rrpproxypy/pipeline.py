@@ -0,0 +1,281 @@
+import collections
+import json
+import os
+import threading
+import time
+
+from rrpproxypy import bulk
+from rrpproxypy import cache
+
+
+# The statuses of a job in the journal.
+DONE = 'done'
+FAILED = 'failed'
+STARTED = 'started'
+TEMPORARY = 'temporary'
+UNKNOWN = 'unknown'
+
+
+Outcome = collections.namedtuple(
+    'Outcome',
+    [
+        'key',
+        'command',
+        'args',
+        'status',
+        'code',
+        'description',
+    ])
+Outcome.__doc__ = """
+The outcome of a job in a bulk mutation.
+
+Attributes:
+    key (str): The key identifying the job.
+    command (str): The API command.
+    args (dict): The arguments to the API call.
+    status (str): :data:`DONE` when the call succeeded (a 2xx code),
+        :data:`TEMPORARY` for a temporary error (4xx), :data:`FAILED` for a
+        permanent error (5xx) and :data:`UNKNOWN` when no response with a
+        valid code was received, so the call may or may not have been
+        applied. Jobs are journaled as :data:`STARTED` before they are
+        called.
+    code (int): The response code, or `None`.
+    description (str): The response description or the error.
+
+"""
+
+
+def job_key(
+        command,
+        args):
+    """
+    Make a key identifying a job, regardless of the order of the arguments.
+
+    Args:
+        command (str): The API command.
+        args (dict): The arguments to the API call.
+
+    Returns:
+        str: The key.
+
+    """
+    return json.dumps(cache.make_key(command, args))
+
+
+def response_code(response):
+    """
+    Get the code of a response.
+
+    Args:
+        response (dict): The response.
+
+    Returns:
+        int: The code, or `None` when the response has no valid code.
+
+    """
+    try:
+        return int(response['code'])
+    except (KeyError, ValueError):
+        return None
+
+
+def interpret(response):
+    """
+    Get the status of a job from its response.
+
+    RRP response codes are 2xx on success, 4xx for temporary errors which
+    may succeed when tried again and 5xx for permanent errors. A response
+    without a valid code (e.g. the HTML page of an overloaded proxy) doesn't
+    tell whether the call has run, so its outcome is unknown.
+
+    Args:
+        response (dict): The response.
+
+    Returns:
+        str: The status.
+
+    """
+    code = response_code(response)
+    if code is None:
+        return UNKNOWN
+    if 200 <= code < 300:
+        return DONE
+    if 400 <= code < 500:
+        return TEMPORARY
+    if 500 <= code < 600:
+        return FAILED
+    return UNKNOWN
+
+
+class Journal:
+    def __init__(
+            self,
+            path,
+            sync=True):
+        """
+        An append-only journal of the outcomes of jobs.
+
+        Every outcome is appended to the file as a line of JSON as soon as
+        it is known, so the journal survives a crash of the process. When a
+        job has several outcomes (e.g. after a rerun), the last one counts.
+        A job which was started but has no outcome (because the process
+        crashed during the call) is loaded as :data:`UNKNOWN`.
+
+        Args:
+            path (str): The path of the journal.
+
+        Keyword Args:
+            sync (bool): Flush every outcome to disk with fsync.
+
+        """
+        self.path = path
+        self.sync = sync
+        self.outcomes = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    # A line cut short by a crash is ignored.
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    outcome = Outcome(**{
+                        name: entry.get(name) for name in Outcome._fields})
+                    if outcome.status == STARTED:
+                        outcome = outcome._replace(status=UNKNOWN)
+                    self.outcomes[outcome.key] = outcome
+        self._file = open(path, 'a')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the journal.
+
+        """
+        self._file.close()
+
+    def record(self, outcome):
+        """
+        Append an outcome to the journal.
+
+        Args:
+            outcome (Outcome): The outcome.
+
+        """
+        line = json.dumps(dict(outcome._asdict(), time=time.time()))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self.outcomes[outcome.key] = outcome
+
+    def status(self, key):
+        """
+        Get the last status of a job.
+
+        Args:
+            key (str): The key of the job.
+
+        Returns:
+            str: The status, or `None` when the job hasn't run.
+
+        """
+        outcome = self.outcomes.get(key)
+        return outcome.status if outcome is not None else None
+
+    def counts(self):
+        """
+        Count the jobs by their last status.
+
+        Returns:
+            Counter: The number of jobs by status.
+
+        """
+        return collections.Counter(
+            outcome.status for outcome in self.outcomes.values())
+
+
+def run_jobs(
+        client,
+        jobs,
+        journal,
+        workers=10,
+        retry_unknown=False):
+    """
+    Run API calls concurrently, journaling their outcomes.
+
+    Jobs which are done or have failed permanently according to the journal
+    are skipped, so a rerun after a crash continues where it stopped and
+    only tries temporary errors again. Jobs of which the outcome is unknown
+    (e.g. the connection broke after the call was sent) are skipped as well
+    unless `retry_unknown` is set, since the API may have applied them.
+    Duplicate jobs are only run once.
+
+    The calls are rate limited by the rate limiter of the client, if any.
+
+    Args:
+        client (RRPproxy): The client to call the API with.
+        jobs (iterable): Pairs of the API command and a dict of arguments,
+            e.g. `('RenewDomain', {'domain': 'a.com', 'period': 1})`.
+        journal (Journal): The journal.
+
+    Keyword Args:
+        workers (int): The number of concurrent calls.
+        retry_unknown (bool): Run jobs with an unknown outcome again.
+
+    Yields:
+        Outcome: The outcome of every job which has run, in order of
+            completion.
+
+    """
+    skip = {DONE, FAILED}
+    if not retry_unknown:
+        skip.add(UNKNOWN)
+
+    def pending():
+        seen = set()
+        for command, args in jobs:
+            key = job_key(command, args)
+            if key in seen or journal.status(key) in skip:
+                continue
+            seen.add(key)
+            yield key, command, args
+
+    def run(job):
+        key, command, args = job
+        journal.record(Outcome(key, command, args, STARTED, None, None))
+        try:
+            response = client.request(command, **args)
+        except Exception as error:
+            outcome = Outcome(
+                key,
+                command,
+                args,
+                UNKNOWN,
+                None,
+                '{}: {}'.format(type(error).__name__, error))
+        else:
+            outcome = Outcome(
+                key,
+                command,
+                args,
+                interpret(response),
+                response_code(response),
+                response.get('description'))
+        # The outcome is journaled by the worker, so calls which are still
+        # running when the caller stops are journaled as well.
+        journal.record(outcome)
+        return outcome
+
+    for result in bulk.fan_out(run, pending(), workers=workers):
+        if result.error is not None:
+            # The journal couldn't be written.
+            raise result.error
+        yield result.response
@@ -0,0 +1,417 @@
+import array
+import bisect
+import datetime
+import json
+import sqlite3
+
+from rrpproxypy import fields
+
+
+# The QueryDomainList filter for domains updated after a date.
+UPDATED_AFTER = 'updatedafter'
+
+# The columns which are indexed in the store.
+DOMAIN_COLUMN = 'domain'
+ZONE_COLUMN = 'domain zone'
+UPDATED_COLUMN = 'domain updated date'
+EXPIRES_COLUMN = 'domain registration expiration date'
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# The expiration of domains without an expiration date, after all others.
+NEVER = 2 ** 62
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    zone TEXT,
+    updated TEXT,
+    expires TEXT,
+    generation INTEGER,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS domains_zone ON domains (zone);
+CREATE INDEX IF NOT EXISTS domains_expires ON domains (expires);
+CREATE TABLE IF NOT EXISTS state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class PortfolioStore:
+    def __init__(self, path):
+        """
+        A local SQLite copy of the domain portfolio.
+
+        The store is filled using QueryDomainList and kept up to date by
+        :meth:`sync`, which only fetches domains updated since the last
+        sync. Domains can then be queried locally by expiration date and
+        zone. QueryDomainList has no status column; use StatusDomain for
+        the status of a domain.
+
+        Args:
+            path (str): The path of the database, or `:memory:`.
+
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the database.
+
+        """
+        self.connection.close()
+
+    def _get_state(self, name):
+        row = self.connection.execute(
+            'SELECT value FROM state WHERE name = ?',
+            (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name, value):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)',
+            (name, value))
+
+    @property
+    def watermark(self):
+        """
+        The latest update date of the synced domains, or `None`.
+
+        """
+        return self._get_state('watermark')
+
+    def sync(
+            self,
+            client,
+            full=False,
+            page_size=1000):
+        """
+        Fetch the domains which have changed since the last sync.
+
+        Domains are fetched in order of their update date. Every page is
+        committed together with the latest update date in it (the
+        watermark), so an interrupted sync resumes where it stopped. The
+        first sync, or a full sync, fetches all domains; a full sync also
+        removes domains which are no longer in the portfolio.
+
+        Args:
+            client (RRPproxy): The client to fetch the domains with.
+
+        Keyword Args:
+            full (bool): Fetch all domains instead of only changed ones.
+            page_size (int): The number of domains to fetch per call.
+
+        Returns:
+            int: The number of domains fetched.
+
+        """
+        filters = {'orderby': 'DOMAINUPDATEDDATE'}
+        watermark = None if full else self.watermark
+        if watermark is not None:
+            # Overlap by a second, so domains updated in the same second as
+            # the watermark are not missed; storing them again is harmless.
+            since = datetime.datetime.strptime(
+                watermark,
+                DATE_FORMAT) - datetime.timedelta(seconds=1)
+            filters[UPDATED_AFTER] = since.strftime(DATE_FORMAT)
+        generation = int(self._get_state('generation') or 0) + 1
+        count = 0
+        batch = []
+        for record in client.iter_domains(page_size=page_size, **filters):
+            batch.append(record)
+            if len(batch) == page_size:
+                count += self._store(batch, generation)
+                batch = []
+        count += self._store(batch, generation)
+        with self.connection:
+            if full:
+                self.connection.execute(
+                    'DELETE FROM domains WHERE generation < ?',
+                    (generation,))
+            self._set_state('generation', str(generation))
+        return count
+
+    def _store(
+            self,
+            records,
+            generation):
+        """
+        Store records and move the watermark in a single transaction.
+
+        Returns:
+            int: The number of records stored.
+
+        """
+        if not records:
+            return 0
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO domains '
+                '(domain, zone, updated, expires, generation, record) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        record[DOMAIN_COLUMN],
+                        record.get(ZONE_COLUMN),
+                        record.get(UPDATED_COLUMN),
+                        record.get(EXPIRES_COLUMN),
+                        generation,
+                        json.dumps(dict(record)),
+                    )
+                    for record in records])
+            updated = max(
+                (record.get(UPDATED_COLUMN) or '' for record in records),
+                default='')
+            if updated and updated > (self.watermark or ''):
+                self._set_state('watermark', updated)
+        return len(records)
+
+    def find(
+            self,
+            zone=None,
+            expires_after=None,
+            expires_before=None):
+        """
+        Find domains in the store, ordered by expiration date.
+
+        Keyword Args:
+            zone (str): Only domains in this zone.
+            expires_after (datetime): Only domains expiring at or after
+                this date.
+            expires_before (datetime): Only domains expiring before this
+                date.
+
+        Returns:
+            list: The domain records as dicts.
+
+        """
+        conditions = []
+        params = []
+        if zone is not None:
+            conditions.append('zone = ?')
+            params.append(zone.lower())
+        if expires_after is not None:
+            conditions.append('expires >= ?')
+            params.append(expires_after.strftime(DATE_FORMAT))
+        if expires_before is not None:
+            conditions.append('expires < ?')
+            params.append(expires_before.strftime(DATE_FORMAT))
+        query = 'SELECT record FROM domains'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY expires'
+        return [
+            json.loads(record)
+            for record, in self.connection.execute(query, params)]
+
+    def expiring(
+            self,
+            days,
+            now=None):
+        """
+        Find domains expiring within a number of days.
+
+        Args:
+            days (int): The number of days.
+
+        Keyword Args:
+            now (datetime): The current date and time.
+
+        Returns:
+            list: The domain records as dicts, ordered by expiration date.
+
+        """
+        now = now or datetime.datetime.now()
+        return self.find(
+            expires_after=now,
+            expires_before=now + datetime.timedelta(days=days))
+
+    def __len__(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM domains').fetchone()[0]
+
+
+def _seconds(value):
+    """
+    Convert an expiration date to seconds since the epoch.
+
+    Args:
+        value: A datetime, a date string in the API format or `None`.
+
+    Returns:
+        int: The number of seconds, or :data:`NEVER`.
+
+    """
+    if isinstance(value, str):
+        value = fields.parse_datetime(value)
+    if not isinstance(value, datetime.datetime):
+        return NEVER
+    return int((value - EPOCH).total_seconds())
+
+
+class PortfolioIndex:
+    def __init__(self, records):
+        """
+        A compact, in-memory index of the domain portfolio.
+
+        Domains are kept in order of expiration date in parallel arrays:
+        the names, the expiration dates as seconds and the zones as small
+        integers. Range queries on the expiration date bisect the dates;
+        the zones have a hash index mapping them to the (sorted) positions
+        of their domains.
+
+        Args:
+            records (iterable): Domain records as yielded by
+                :meth:`rrpproxypy.RRPproxy.iter_domains` or
+                :meth:`PortfolioStore.find`.
+
+        """
+        rows = sorted(
+            (
+                _seconds(record.get(EXPIRES_COLUMN)),
+                record[DOMAIN_COLUMN],
+                (record.get(ZONE_COLUMN) or
+                    record[DOMAIN_COLUMN].rpartition('.')[2]).lower(),
+            )
+            for record in records)
+        self.zones = []
+        zone_ids = {}
+        self._names = []
+        self._expires = array.array('q')
+        self._zones = array.array('H')
+        self._by_zone = {}
+        for position, (expires, name, zone) in enumerate(rows):
+            zone_id = zone_ids.get(zone)
+            if zone_id is None:
+                zone_id = zone_ids[zone] = len(self.zones)
+                self.zones.append(zone)
+                self._by_zone[zone] = array.array('I')
+            self._names.append(name)
+            self._expires.append(expires)
+            self._zones.append(zone_id)
+            self._by_zone[zone].append(position)
+        self._positions = None
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Create an index from a QueryDomainList response.
+
+        Args:
+            response (Response): The response, with `wide=1` columns.
+
+        Returns:
+            PortfolioIndex: The index.
+
+        """
+        return cls(response.rows())
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._lookup()
+
+    def _lookup(self):
+        """
+        Get the positions by domain name, created on first use.
+
+        """
+        if self._positions is None:
+            self._positions = {
+                name: position for position, name in enumerate(self._names)}
+        return self._positions
+
+    def get(self, name):
+        """
+        Get a domain.
+
+        Args:
+            name (str): The domain name.
+
+        Returns:
+            dict: The domain, zone and expiration date, or `None`.
+
+        """
+        position = self._lookup().get(name)
+        if position is None:
+            return None
+        expires = self._expires[position]
+        return {
+            DOMAIN_COLUMN: name,
+            ZONE_COLUMN: self.zones[self._zones[position]],
+            EXPIRES_COLUMN: (
+                None if expires == NEVER
+                else EPOCH + datetime.timedelta(seconds=expires)),
+        }
+
+    def find(
+            self,
+            zone=None,
+            expires_after=None,
+            expires_before=None):
+        """
+        Find domains, ordered by expiration date.
+
+        Keyword Args:
+            zone (str): Only domains in this zone.
+            expires_after (datetime): Only domains expiring at or after
+                this date.
+            expires_before (datetime): Only domains expiring before this
+                date.
+
+        Returns:
+            list: The domain names.
+
+        """
+        low = 0
+        high = len(self._expires)
+        if expires_after is not None:
+            low = bisect.bisect_left(self._expires, _seconds(expires_after))
+        if expires_before is not None:
+            high = bisect.bisect_left(
+                self._expires,
+                _seconds(expires_before),
+                low)
+        if zone is None:
+            return self._names[low:high]
+        positions = self._by_zone.get(zone.lower())
+        if positions is None:
+            return []
+        start = bisect.bisect_left(positions, low)
+        end = bisect.bisect_left(positions, high, start)
+        names = self._names
+        return [names[position] for position in positions[start:end]]
+
+    def expiring(
+            self,
+            days,
+            now=None):
+        """
+        Find domains expiring within a number of days.
+
+        Args:
+            days (int): The number of days.
+
+        Keyword Args:
+            now (datetime): The current date and time.
+
+        Returns:
+            list: The domain names, ordered by expiration date.
+
+        """
+        now = now or datetime.datetime.now()
+        return self.find(
+            expires_after=now,
+            expires_before=now + datetime.timedelta(days=days))
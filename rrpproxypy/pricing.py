@@ -0,0 +1,319 @@
+from decimal import Decimal
+import collections
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+
+from rrpproxypy import bulk
+from rrpproxypy import exceptions
+
+
+# The DomainPrice types which are priced by default.
+DEFAULT_ACTIONS = (
+    'ADDDOMAIN',
+    'RENEWDOMAIN',
+    'TRANSFERDOMAIN',
+    'RESTOREDOMAIN',
+)
+
+
+Price = collections.namedtuple(
+    'Price',
+    [
+        'amount',
+        'currency',
+    ])
+Price.__doc__ = """
+The price of an action on a domain in a zone.
+
+Attributes:
+    amount (Decimal): The price.
+    currency (str): The currency of the price.
+
+"""
+
+
+def fingerprint(response):
+    """
+    Fingerprint a GetZoneInfo response.
+
+    Args:
+        response (dict): The response.
+
+    Returns:
+        str: A digest of the zone properties.
+
+    """
+    properties = json.dumps(
+        response.get('properties', {}),
+        sort_keys=True)
+    return hashlib.sha1(properties.encode()).hexdigest()
+
+
+class PriceMatrix:
+    def __init__(
+            self,
+            prices=None,
+            fingerprints=None,
+            errors=None):
+        """
+        The prices of every (zone, action, period) combination.
+
+        A matrix is usually created using :meth:`build` or :meth:`load`.
+        Lookups are dict lookups.
+
+        Keyword Args:
+            prices (dict): The prices by (zone, action, period).
+            fingerprints (dict): The zone info fingerprints by zone, used
+                to refresh only the zones which have changed.
+            errors (dict): The errors of the cells which couldn't be
+                fetched by (zone, action, period).
+
+        """
+        self.prices = prices or {}
+        self.fingerprints = fingerprints or {}
+        self.errors = errors or {}
+
+    def __getitem__(self, key):
+        zone, action, period = key
+        return self.prices[zone.lower(), action.upper(), int(period)]
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self.prices)
+
+    def get(
+            self,
+            zone,
+            action,
+            period=1):
+        """
+        Get a price.
+
+        Args:
+            zone (str): The zone, e.g. `com`.
+            action (str): The DomainPrice type, e.g. `ADDDOMAIN`.
+
+        Keyword Args:
+            period (int): The period in years.
+
+        Returns:
+            Price: The price, or `None` when it isn't known.
+
+        """
+        try:
+            return self[zone, action, period]
+        except KeyError:
+            return None
+
+    @property
+    def zones(self):
+        """
+        The zones in the matrix.
+
+        """
+        zones = set(self.fingerprints)
+        zones.update(zone for zone, action, period in self.prices)
+        zones.update(zone for zone, action, period in self.errors)
+        return sorted(zones)
+
+    @classmethod
+    def build(
+            cls,
+            client,
+            zones,
+            actions=DEFAULT_ACTIONS,
+            periods=(1,),
+            workers=10):
+        """
+        Build a price matrix by fetching every price concurrently.
+
+        Cells for which DomainPrice fails are left out of the matrix; their
+        errors are stored in :attr:`errors`.
+
+        Args:
+            client (RRPproxy): The client to fetch the prices with.
+            zones (iterable): The zones.
+
+        Keyword Args:
+            actions (iterable): The DomainPrice types.
+            periods (iterable): The periods in years.
+            workers (int): The number of concurrent requests.
+
+        Returns:
+            PriceMatrix: The matrix.
+
+        """
+        zones = [zone.lower() for zone in zones]
+        matrix = cls()
+        matrix.fingerprints.update(
+            matrix._fingerprint_zones(client, zones, workers))
+        matrix._fetch_prices(client, zones, actions, periods, workers)
+        return matrix
+
+    def refresh(
+            self,
+            client,
+            actions=DEFAULT_ACTIONS,
+            periods=(1,),
+            workers=10):
+        """
+        Refetch the prices of zones whose zone info has changed.
+
+        The zone info of every zone is fetched and compared with the zone
+        info the prices were fetched with. Only the prices of changed zones,
+        zones of which the zone info can't be fetched and zones with cells
+        which have failed before are fetched again.
+
+        Args:
+            client (RRPproxy): The client to fetch the prices with.
+
+        Keyword Args:
+            actions (iterable): The DomainPrice types.
+            periods (iterable): The periods in years.
+            workers (int): The number of concurrent requests.
+
+        Returns:
+            list: The zones which have been refetched.
+
+        """
+        zones = self.zones
+        fingerprints = self._fingerprint_zones(client, zones, workers)
+        failed = {zone for zone, action, period in self.errors}
+        changed = sorted(
+            zone for zone in zones
+            if zone in failed or
+            fingerprints.get(zone) is None or
+            fingerprints[zone] != self.fingerprints.get(zone))
+        self.fingerprints.update(fingerprints)
+        self._fetch_prices(client, changed, actions, periods, workers)
+        return changed
+
+    def _fingerprint_zones(
+            self,
+            client,
+            zones,
+            workers):
+        """
+        Fetch the zone info of zones concurrently and fingerprint it.
+
+        Returns:
+            dict: The fingerprints by zone, leaving out zones of which the
+                call has failed or returned an error code.
+
+        """
+        return {
+            result.input: fingerprint(result.response)
+            for result in bulk.fan_out(
+                client.get_zone_info,
+                zones,
+                workers=workers)
+            if result.error is None and
+            str(result.response.get('code')) == '200'}
+
+    def _fetch_prices(
+            self,
+            client,
+            zones,
+            actions,
+            periods,
+            workers):
+        """
+        Fetch the prices of every cell of the given zones concurrently.
+
+        """
+        cells = itertools.product(
+            zones,
+            [action.upper() for action in actions],
+            [int(period) for period in periods])
+
+        def price(cell):
+            zone, action, period = cell
+            response = client.domain_price(
+                'example.{}'.format(zone),
+                type=action,
+                period=period)
+            # Parsed here, so that a malformed response only fails its cell.
+            properties = response['properties']
+            return Price(
+                Decimal(properties['price']),
+                properties['currency'])
+
+        for result in bulk.fan_out(price, cells, workers=workers):
+            if result.error is not None:
+                self.prices.pop(result.input, None)
+                self.errors[result.input] = result.error
+                continue
+            self.errors.pop(result.input, None)
+            self.prices[result.input] = result.response
+
+    def save(self, path):
+        """
+        Save the matrix to a JSON file.
+
+        The file is replaced atomically, so concurrent readers either see
+        the old or the new matrix. Errors are saved as their messages.
+
+        Args:
+            path (str): The path to save to.
+
+        """
+        data = {
+            'prices': [
+                [zone, action, period, str(price.amount), price.currency]
+                for (zone, action, period), price in sorted(
+                    self.prices.items())],
+            'fingerprints': self.fingerprints,
+            'errors': [
+                [
+                    zone,
+                    action,
+                    period,
+                    '{}: {}'.format(type(error).__name__, error),
+                ]
+                for (zone, action, period), error in sorted(
+                    self.errors.items())],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+                'w',
+                dir=directory,
+                delete=False) as file:
+            json.dump(data, file)
+        os.replace(file.name, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a matrix saved using :meth:`save`.
+
+        Loaded errors are :class:`rrpproxypy.exceptions.Failure` instances
+        with the saved message.
+
+        Args:
+            path (str): The path to load from.
+
+        Returns:
+            PriceMatrix: The matrix.
+
+        """
+        with open(path) as file:
+            data = json.load(file)
+        return cls(
+            prices={
+                (zone, action, period): Price(Decimal(amount), currency)
+                for zone, action, period, amount, currency
+                in data['prices']},
+            fingerprints=data['fingerprints'],
+            errors={
+                (zone, action, period): exceptions.Failure(message)
+                for zone, action, period, message
+                in data.get('errors', [])})
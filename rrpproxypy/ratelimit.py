@@ -0,0 +1,245 @@
+import contextlib
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+
+
+# Response codes the API uses for throttled or temporarily overloaded calls.
+THROTTLED_CODES = frozenset([421, 429])
+
+# HTTP status codes meaning the call has been throttled.
+THROTTLED_STATUS_CODES = frozenset([429, 503])
+
+
+class State:
+    """
+    The state of a token bucket.
+
+    Attributes:
+        tokens (float): The number of available tokens.
+        updated (float): When the tokens were last refilled.
+        rate (float): The current rate in calls per second.
+        decreased (float): When the rate was last decreased.
+
+    """
+    __slots__ = ('tokens', 'updated', 'rate', 'decreased')
+    format = struct.Struct('dddd')
+
+    def __init__(
+            self,
+            tokens,
+            updated,
+            rate,
+            decreased):
+        self.tokens = tokens
+        self.updated = updated
+        self.rate = rate
+        self.decreased = decreased
+
+    def pack(self):
+        return self.format.pack(
+            self.tokens,
+            self.updated,
+            self.rate,
+            self.decreased)
+
+    @classmethod
+    def unpack(cls, data):
+        return cls(*cls.format.unpack(data))
+
+
+class RateLimiter:
+    def __init__(
+            self,
+            rate,
+            burst=None,
+            min_rate=None,
+            backoff=0.5,
+            increase=None,
+            cooldown=1.0,
+            retries=3,
+            throttled_codes=THROTTLED_CODES,
+            clock=time.monotonic,
+            sleep=time.sleep):
+        """
+        An adaptive, thread-safe token bucket rate limiter.
+
+        Every call takes a token; tokens are refilled at the current rate
+        up to the burst size. When the API throttles a call the rate is
+        multiplied by `backoff` (at most once per `cooldown` seconds, since
+        a burst of throttled calls is a single signal). Every successful
+        call increases the rate by `increase` until it is back at the
+        configured rate. This additive increase and multiplicative decrease
+        settles just below the highest rate the API sustains.
+
+        Args:
+            rate (float): The maximum rate in calls per second.
+
+        Keyword Args:
+            burst (float): The bucket size. Defaults to one second of calls.
+            min_rate (float): The lowest rate to back off to. Defaults to a
+                tenth of the rate.
+            backoff (float): The factor to decrease the rate with.
+            increase (float): The rate increase per successful call.
+                Defaults to a hundredth of the rate.
+            cooldown (float): The minimum number of seconds between two
+                decreases.
+            retries (int): The number of times a throttled call is retried.
+            throttled_codes (set): The response codes meaning the call has
+                been throttled.
+            clock (callable): A monotonic clock.
+            sleep (callable): The function to wait with.
+
+        """
+        self.max_rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.backoff = backoff
+        self.increase = increase if increase is not None else rate / 100
+        self.cooldown = cooldown
+        self.retries = retries
+        self.throttled_codes = throttled_codes
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._state = State(self.burst, clock(), rate, float('-inf'))
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """
+        Lock and yield the bucket state.
+
+        """
+        with self._lock:
+            yield self._state
+
+    @property
+    def rate(self):
+        """
+        The current rate in calls per second.
+
+        """
+        with self._transaction() as state:
+            return state.rate
+
+    def acquire(self):
+        """
+        Take a token, waiting until one is available.
+
+        When the bucket is empty the token is reserved (the number of
+        tokens becomes negative) and the caller waits until it would have
+        been refilled. Waiting callers are therefore served in order.
+
+        """
+        with self._transaction() as state:
+            now = self.clock()
+            # The monotonic clock restarts when the host reboots, while a
+            # shared state file is kept; time never runs backwards here.
+            state.tokens = min(
+                self.burst,
+                state.tokens + max(0.0, now - state.updated) * state.rate)
+            state.updated = now
+            state.tokens -= 1
+            wait = -state.tokens / state.rate
+        if wait > 0:
+            self.sleep(wait)
+
+    def throttled(self):
+        """
+        Report a throttled call, decreasing the rate.
+
+        """
+        with self._transaction() as state:
+            now = self.clock()
+            if (now - state.decreased >= self.cooldown or
+                    now < state.decreased):
+                state.rate = max(self.min_rate, state.rate * self.backoff)
+                state.tokens = min(state.tokens, 0)
+                state.decreased = now
+
+    def succeeded(self):
+        """
+        Report a successful call, increasing the rate.
+
+        """
+        with self._transaction() as state:
+            if state.rate < self.max_rate:
+                state.rate = min(self.max_rate, state.rate + self.increase)
+
+    def is_throttled(
+            self,
+            status_code,
+            response):
+        """
+        Check whether a call has been throttled.
+
+        Args:
+            status_code (int): The HTTP status code.
+            response (dict): The parsed response.
+
+        Returns:
+            bool: Whether the call has been throttled.
+
+        """
+        if status_code in THROTTLED_STATUS_CODES:
+            return True
+        try:
+            return int(response['code']) in self.throttled_codes
+        except (KeyError, ValueError):
+            return False
+
+
+class FileRateLimiter(RateLimiter):
+    def __init__(
+            self,
+            path,
+            rate,
+            **kwargs):
+        """
+        A rate limiter shared between processes on the same host.
+
+        The bucket state is kept in a small memory mapped file, which is
+        locked using `flock` while it is updated. All processes using the
+        same path share the tokens and the adaptive rate. This requires a
+        POSIX system.
+
+        Args:
+            path (str): The path of the state file. It is created when it
+                doesn't exist.
+            rate (float): The maximum rate in calls per second.
+            **kwargs: See :class:`RateLimiter`.
+
+        """
+        super().__init__(rate, **kwargs)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file = os.fdopen(fd, 'r+b')
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < State.format.size:
+                self._file.write(self._state.pack())
+                self._file.flush()
+            self._map = mmap.mmap(fd, State.format.size)
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def close(self):
+        """
+        Close the state file.
+
+        """
+        self._map.close()
+        self._file.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                state = State.unpack(self._map[:State.format.size])
+                yield state
+                self._map[:State.format.size] = state.pack()
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
@@ -0,0 +1,67 @@
+import threading
+
+
+class _Call:
+    """
+    A call in flight.
+
+    """
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce identical concurrent calls into a single call.
+
+        The first caller for a key makes the call, callers arriving with
+        the same key while it is in flight wait for it and receive the same
+        result (or exception). The number of calls which were collapsed
+        into another call is counted in :attr:`collapsed`.
+
+        """
+        self.collapsed = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(
+            self,
+            key,
+            function):
+        """
+        Call a function unless a call with the same key is in flight.
+
+        Args:
+            key: A hashable key identifying the call.
+            function (callable): The function to call.
+
+        Returns:
+            The result of the function.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.collapsed += 1
+        if leader:
+            try:
+                call.result = function()
+            except Exception as error:
+                call.error = error
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
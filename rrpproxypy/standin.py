@@ -0,0 +1,418 @@
+from http import server
+from urllib import parse
+import argparse
+import datetime
+import gzip
+import random
+import socketserver
+import ssl
+import threading
+import time
+
+
+# The columns of a wide QueryDomainList response.
+DOMAIN_COLUMNS = (
+    'domain',
+    'domain idn',
+    'roid',
+    'domain created date',
+    'domain created by',
+    'domain updated date',
+    'domain updated by',
+    'domain registration expiration date',
+    'domain renewal date',
+    'domain zone',
+    'renewalmode',
+    'transfermode',
+    'domaintags',
+    'domaincomment',
+)
+
+
+def format_response(
+        code,
+        description,
+        properties=None,
+        runtime=0.0):
+    """
+    Format a response in the RRP text format.
+
+    Args:
+        code (int): The response code.
+        description (str): The response description.
+
+    Keyword Args:
+        properties (dict): The properties by name; lists are indexed.
+        runtime (float): The runtime to report.
+
+    Returns:
+        str: The response text.
+
+    """
+    lines = [
+        '[RESPONSE]',
+        'code = {}'.format(code),
+        'description = {}'.format(description),
+        'queuetime = 0',
+        'runtime = {:.3f}'.format(runtime),
+    ]
+    for name, values in (properties or {}).items():
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for index, value in enumerate(values):
+            lines.append('property[{}][{}] = {}'.format(name, index, value))
+    lines.append('EOF')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def make_domains(
+        count,
+        zones=('com', 'net', 'org')):
+    """
+    Generate a synthetic portfolio.
+
+    Args:
+        count (int): The number of domains.
+
+    Keyword Args:
+        zones (iterable): The zones to spread the domains over.
+
+    Returns:
+        list: A dict per domain, with the QueryDomainList columns.
+
+    """
+    start = datetime.datetime(2019, 1, 1)
+    domains = []
+    for index in range(count):
+        zone = zones[index % len(zones)]
+        name = 'domain{}.{}'.format(index, zone)
+        created = start + datetime.timedelta(hours=index)
+        updated = created + datetime.timedelta(days=index % 30)
+        expires = created + datetime.timedelta(days=365 + index % 700)
+        domains.append({
+            'domain': name,
+            'domain idn': name,
+            'roid': '{}_DOMAIN_{}-KEY'.format(index, zone.upper()),
+            'domain created date': str(created),
+            'domain created by': 'standin',
+            'domain updated date': str(updated),
+            'domain updated by': 'standin',
+            'domain registration expiration date': str(expires),
+            'domain renewal date': str(expires),
+            'domain zone': zone,
+            'renewalmode': 'DEFAULT',
+            'transfermode': 'DEFAULT',
+            'domaintags': '',
+            'domaincomment': '',
+        })
+    return domains
+
+
+class StandIn:
+    def __init__(
+            self,
+            domains=None,
+            latency=0.0,
+            error_rate=0.0,
+            throttle_rate=None,
+            max_limit=None,
+            seed=None):
+        """
+        A local stand-in for the RRP API.
+
+        The stand-in answers a subset of the commands with synthetic data,
+        and can simulate the latency, failures and throttling of the real
+        API. Commands are dispatched to `command_<name>` methods (in lower
+        case); subclasses can add or override commands.
+
+        Keyword Args:
+            domains (list): The portfolio, see :func:`make_domains`.
+                Defaults to 100 synthetic domains.
+            latency (float): The number of seconds to wait before
+                answering.
+            error_rate (float): The fraction of calls failing with code 421.
+            throttle_rate (float): The number of calls per second after
+                which calls are throttled with HTTP status 429, or `None`.
+            max_limit (int): The maximum number of rows of a list response,
+                whatever `limit` is asked for, or `None`.
+            seed: The seed for the simulated failures.
+
+        """
+        self.domains = domains if domains is not None else make_domains(100)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_limit = max_limit
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = (0, 0)
+
+    def handle(self, query):
+        """
+        Answer a call.
+
+        Args:
+            query (dict): The query arguments, with lower case names.
+
+        Returns:
+            tuple: The HTTP status code and the response text.
+
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.calls += 1
+            if self._throttled():
+                return 429, format_response(429, 'Too many requests')
+            failed = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            return 200, format_response(
+                421,
+                'Command failed due to server error. Client should try '
+                'again')
+        command = query.get('command', '').lower()
+        method = getattr(self, 'command_' + command, None)
+        if method is None:
+            return 200, format_response(500, 'Invalid command name')
+        code, description, properties = method(query)
+        return 200, format_response(
+            code,
+            description,
+            properties,
+            runtime=time.perf_counter() - started)
+
+    def _throttled(self):
+        """
+        Count a call in the current second and check the throttle rate.
+
+        """
+        if self.throttle_rate is None:
+            return False
+        second = int(time.monotonic())
+        window, count = self._window
+        if window != second:
+            window, count = second, 0
+        self._window = (window, count + 1)
+        return count >= self.throttle_rate
+
+    def command_checkdomains(self, query):
+        names = sorted(
+            (int(name[6:]), value) for name, value in query.items()
+            if name.startswith('domain') and name[6:].isdigit())
+        registered = {domain['domain'] for domain in self.domains}
+        return 200, 'Command completed successfully', {
+            'domaincheck': [
+                '211 Domain name not available' if name in registered
+                else '210 Domain name available'
+                for _, name in names],
+        }
+
+    def command_startsession(self, query):
+        return 200, 'Command completed successfully', {
+            'sessionid': 'standin{}'.format(self.calls)}
+
+    def command_endsession(self, query):
+        return 200, 'Command completed successfully', {}
+
+    def command_statusdomain(self, query):
+        for domain in self.domains:
+            if domain['domain'] == query.get('domain'):
+                return 200, 'Command completed successfully', {
+                    'domain': domain['domain'],
+                    'status': 'ACTIVE',
+                    'registration expiration date': domain[
+                        'domain registration expiration date'],
+                    'zone': domain['domain zone'],
+                }
+        return 545, 'Entity reference not found', {}
+
+    def command_getzoneinfo(self, query):
+        zone = query.get('zone', '').lower()
+        return 200, 'Command completed successfully', {
+            'zone': zone,
+            'periods': '1,2,3,4,5,6,7,8,9,10',
+            'idn': '1',
+        }
+
+    def command_domainprice(self, query):
+        zone = query.get('domain', '').rpartition('.')[2]
+        period = int(query.get('period', 1))
+        price = '{:.4f}'.format(8 + len(zone) * period)
+        return 200, 'Command completed successfully', {
+            'domain': query.get('domain'),
+            'zone': zone,
+            'period': period,
+            'currency': 'USD',
+            'price': price,
+        }
+
+    def command_queryexchangerates(self, query):
+        return 200, 'Command completed successfully', {
+            'currency from': ['EUR', 'EUR', 'EUR'],
+            'currency to': ['USD', 'GBP', 'JPY'],
+            'rate': ['1.1400', '0.8800', '128.5000'],
+        }
+
+    def command_querydomainlist(self, query):
+        domains = self.domains
+        if 'zone' in query:
+            domains = [
+                domain for domain in domains
+                if domain['domain zone'] == query['zone'].lower()]
+        if 'updatedafter' in query:
+            domains = [
+                domain for domain in domains
+                if domain['domain updated date'] > query['updatedafter']]
+        if 'orderby' in query:
+            orderby = query['orderby'].upper()
+            for column in DOMAIN_COLUMNS:
+                if column.replace(' ', '').upper() == orderby:
+                    domains = sorted(domains, key=lambda d: d[column])
+        first = int(query.get('first', 0))
+        limit = int(query.get('limit', 1000))
+        if self.max_limit is not None:
+            limit = min(limit, self.max_limit)
+        page = domains[first:first + limit]
+        properties = {
+            'column': list(DOMAIN_COLUMNS),
+            'count': len(page),
+            'first': first,
+            'last': first + len(page) - 1,
+            'limit': limit,
+            'total': len(domains),
+        }
+        for column in DOMAIN_COLUMNS:
+            properties[column] = [domain[column] for domain in page]
+        return 200, 'Command completed successfully', properties
+
+
+# Responses larger than this are gzip compressed when the client accepts it.
+COMPRESS_MINIMUM = 1024
+
+
+class Handler(server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = parse.urlparse(self.path)
+        if url.path != '/api/call':
+            self.send_error(404)
+            return
+        self._answer(url.query)
+
+    def do_POST(self):
+        url = parse.urlparse(self.path)
+        length = int(self.headers.get('Content-Length', 0))
+        data = self.rfile.read(length).decode()
+        if url.path != '/api/call':
+            self.send_error(404)
+            return
+        self._answer('&'.join(part for part in (url.query, data) if part))
+
+    def _answer(self, query):
+        query = {
+            name.lower(): value
+            for name, value in parse.parse_qsl(
+                query,
+                keep_blank_values=True)}
+        status_code, text = self.server.standin.handle(query)
+        body = text.encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        accepted = self.headers.get('Accept-Encoding', '')
+        if len(body) >= COMPRESS_MINIMUM and 'gzip' in accepted:
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(socketserver.ThreadingMixIn, server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(
+            self,
+            standin=None,
+            host='127.0.0.1',
+            port=0,
+            certfile=None,
+            keyfile=None):
+        """
+        An HTTP server serving a stand-in on `/api/call`.
+
+        Use the server as a context manager to serve in a background
+        thread, and pass its :attr:`url` to a client.
+
+        Keyword Args:
+            standin (StandIn): The stand-in to serve. Defaults to a
+                :class:`StandIn` with its defaults.
+            host (str): The host to listen on.
+            port (int): The port to listen on, `0` picks a free port.
+            certfile (str): A certificate to serve HTTPS with.
+            keyfile (str): The key of the certificate.
+
+        """
+        super().__init__((host, port), Handler)
+        self.standin = standin if standin is not None else StandIn()
+        self.scheme = 'http'
+        if certfile is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+            self.scheme = 'https'
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        The base URL to pass to a client.
+
+        """
+        host, port = self.server_address[:2]
+        if self.scheme == 'https':
+            host = 'localhost'
+        return '{}://{}:{}/'.format(self.scheme, host, port)
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self._thread.join()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve a local stand-in for the RRP API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--domains', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float)
+    args = parser.parse_args()
+    standin = StandIn(
+        domains=make_domains(args.domains),
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate)
+    httpd = StandInServer(standin, host=args.host, port=args.port)
+    print('Serving on {}'.format(httpd.url))
+    httpd.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+# Transports perform the HTTP requests of a client. A transport is any object
+# with a `get(url, timeout=None)` method returning a reply with a
+# `status_code` and a `text`, and a `close()` method. Calls with large
+# arguments are sent using `post(url, data=None, headers=None, timeout=None)`
+# instead, the data being the URL encoded form body. Streamed calls pass
+# `stream=True` to `get`; the reply may then offer `iter_lines()` to read the
+# body incrementally. A requests session is a transport; it is what the
+# client uses by default.
+from urllib import parse
+import collections
+import json
+import threading
+
+from rrpproxypy import exceptions
+
+
+# Query arguments which are left out of recordings.
+CREDENTIALS = frozenset(['s_login', 's_pw', 's_sessionid'])
+
+# The response encodings to accept; requests decodes them transparently.
+ACCEPT_ENCODING = 'gzip, deflate'
+
+
+Reply = collections.namedtuple(
+    'Reply',
+    [
+        'status_code',
+        'text',
+    ])
+Reply.__doc__ = """
+A recorded HTTP reply.
+
+Attributes:
+    status_code (int): The HTTP status code.
+    text (str): The response body.
+
+"""
+
+
+def pooled_session(
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False):
+    """
+    Create a session with a pool of keep-alive connections.
+
+    The session accepts gzip and deflate compressed responses.
+
+    Keyword Args:
+        pool_connections (int): The number of connection pools to cache.
+        pool_maxsize (int): The maximum number of connections to keep
+            alive per pool.
+        pool_block (bool): Whether to block when no free connection is
+            available instead of opening a throwaway connection.
+
+    Returns:
+        requests.Session: The session.
+
+    """
+    # requests is imported on first use, so that importing the package (e.g.
+    # by the command line interface) stays fast.
+    import requests
+    from requests import adapters
+
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    adapter = adapters.HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def call_key(
+        url,
+        data=None):
+    """
+    Make a key identifying an API call, regardless of the credentials.
+
+    Args:
+        url (str): The URL of the call.
+
+    Keyword Args:
+        data (str): The URL encoded form body of a POST call.
+
+    Returns:
+        str: The sorted query arguments without credentials, URL encoded.
+
+    """
+    query = parse.parse_qsl(
+        parse.urlparse(url).query,
+        keep_blank_values=True)
+    if data:
+        query += parse.parse_qsl(data, keep_blank_values=True)
+    return parse.urlencode(sorted(
+        (name.lower(), value) for name, value in query
+        if name.lower() not in CREDENTIALS))
+
+
+class RecordingTransport:
+    def __init__(
+            self,
+            transport,
+            path):
+        """
+        Record the replies of another transport.
+
+        Every reply is appended to a file as a line of JSON, holding the
+        call (without credentials), the status code and the text.
+
+        Args:
+            transport: The transport to perform the calls with.
+            path (str): The path of the recording.
+
+        """
+        self.transport = transport
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            url,
+            timeout=None,
+            stream=False):
+        # The reply is recorded as a whole, so it isn't streamed.
+        reply = self.transport.get(url, timeout=timeout)
+        self._record(call_key(url), reply)
+        return reply
+
+    def post(
+            self,
+            url,
+            data=None,
+            headers=None,
+            timeout=None):
+        reply = self.transport.post(
+            url,
+            data=data,
+            headers=headers,
+            timeout=timeout)
+        self._record(call_key(url, data), reply)
+        return reply
+
+    def _record(
+            self,
+            key,
+            reply):
+        line = json.dumps({
+            'call': key,
+            'status_code': reply.status_code,
+            'text': reply.text,
+        })
+        with self._lock:
+            with open(self.path, 'a') as file:
+                file.write(line + '\n')
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport:
+    def __init__(self, path):
+        """
+        Replay the replies recorded by a :class:`RecordingTransport`.
+
+        Replies are matched on the command and arguments. When a call has
+        been recorded several times the replies are replayed in order, the
+        last one being repeated.
+
+        Args:
+            path (str): The path of the recording.
+
+        """
+        self.replies = collections.defaultdict(list)
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    recording = json.loads(line)
+                    self.replies[recording['call']].append(Reply(
+                        recording['status_code'],
+                        recording['text']))
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            url,
+            timeout=None,
+            stream=False):
+        """
+        Replay the reply to a call.
+
+        Raises:
+            NotRecorded: When the call hasn't been recorded.
+
+        """
+        return self._replay(call_key(url))
+
+    def post(
+            self,
+            url,
+            data=None,
+            headers=None,
+            timeout=None):
+        """
+        Replay the reply to a POST call.
+
+        Raises:
+            NotRecorded: When the call hasn't been recorded.
+
+        """
+        return self._replay(call_key(url, data))
+
+    def _replay(self, key):
+        with self._lock:
+            replies = self.replies.get(key)
+            if not replies:
+                raise exceptions.NotRecorded(key)
+            if len(replies) > 1:
+                return replies.pop(0)
+            return replies[0]
+
+    def close(self):
+        pass
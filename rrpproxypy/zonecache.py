@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from rrpproxypy import bulk
+from rrpproxypy import parser
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS zones (
+    zone TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    fetched REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refreshing (
+    zone TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    started REAL NOT NULL
+);
+"""
+
+
+class ZoneInfoCache:
+    def __init__(
+            self,
+            path,
+            max_age=86400,
+            lock_timeout=30,
+            poll_interval=0.05,
+            clock=time.time,
+            sleep=time.sleep):
+        """
+        A GetZoneInfo cache on disk, shared by all processes on a host.
+
+        Responses are stored in SQLite with the time they were fetched. A
+        zone is refreshed by a single process at a time: the process which
+        claims the zone fetches it, while other processes wait for the
+        fresh entry instead of fetching the zone as well. A claim which is
+        older than `lock_timeout` is considered abandoned (e.g. its process
+        crashed) and may be taken over.
+
+        Pass the cache to :class:`rrpproxypy.RRPproxy` as `zone_cache`, so
+        that :meth:`rrpproxypy.RRPproxy.get_zone_info` uses it.
+
+        Args:
+            path (str): The path of the database.
+
+        Keyword Args:
+            max_age (float): The number of seconds an entry is fresh.
+            lock_timeout (float): The number of seconds after which a claim
+                to refresh a zone is abandoned.
+            poll_interval (float): The number of seconds between checks
+                while another process refreshes a zone.
+            clock (callable): The wall clock, shared between processes.
+            sleep (callable): The function to wait with.
+
+        """
+        self.path = path
+        self.max_age = max_age
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._local = threading.local()
+        # Processes opening a new database at the same time create the
+        # tables one at a time.
+        with self._transaction() as connection:
+            for statement in SCHEMA.split(';'):
+                connection.execute(statement)
+
+    def _connect(self):
+        """
+        Get the connection of the current thread.
+
+        Connections are in autocommit mode; statements which must be atomic
+        are run in a :meth:`_transaction`.
+
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.lock_timeout,
+                isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        """
+        Run statements in an immediate transaction.
+
+        """
+        return _Transaction(self._connect())
+
+    def close(self):
+        """
+        Close the connection of the current thread.
+
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def entry(self, zone):
+        """
+        Get the cached response for a zone, fresh or not.
+
+        Args:
+            zone (str): The zone.
+
+        Returns:
+            tuple: The response and the time it was fetched, or `None`.
+
+        """
+        row = self._connect().execute(
+            'SELECT response, fetched FROM zones WHERE zone = ?',
+            (zone.lower(),)).fetchone()
+        if row is None:
+            return None
+        return parser.Response(json.loads(row[0])), row[1]
+
+    def fresh(self, zone):
+        """
+        Get the cached response for a zone when it is fresh.
+
+        Args:
+            zone (str): The zone.
+
+        Returns:
+            Response: The response, or `None`.
+
+        """
+        entry = self.entry(zone)
+        if entry is None or self.clock() - entry[1] >= self.max_age:
+            return None
+        return entry[0]
+
+    def get(
+            self,
+            client,
+            zone):
+        """
+        Get the information about a zone, fetching it when it isn't fresh.
+
+        Failed calls are not cached.
+
+        Args:
+            client (RRPproxy): The client to fetch the zone with.
+            zone (str): The zone.
+
+        Returns:
+            Response: The GetZoneInfo response.
+
+        """
+        zone = zone.lower()
+        while True:
+            response = self.fresh(zone)
+            if response is not None:
+                return response
+            if self._claim(zone):
+                break
+            self.sleep(self.poll_interval)
+        # Another process may have refreshed the zone and released its claim
+        # between the check and the claim.
+        response = self.fresh(zone)
+        if response is not None:
+            self._release(zone)
+            return response
+        try:
+            response = client.request('GetZoneInfo', zone=zone)
+            if int(response['code']) == 200:
+                self.set(zone, response)
+        finally:
+            self._release(zone)
+        return response
+
+    def set(
+            self,
+            zone,
+            response):
+        """
+        Store the response for a zone.
+
+        Args:
+            zone (str): The zone.
+            response (dict): The GetZoneInfo response.
+
+        """
+        self._connect().execute(
+            'INSERT OR REPLACE INTO zones (zone, response, fetched) '
+            'VALUES (?, ?, ?)',
+            (zone.lower(), json.dumps(response), self.clock()))
+
+    def _owner(self):
+        return '{}:{}'.format(os.getpid(), threading.get_ident())
+
+    def _claim(self, zone):
+        """
+        Claim the refresh of a zone, taking over an abandoned claim.
+
+        Returns:
+            bool: Whether the zone has been claimed.
+
+        """
+        now = self.clock()
+        with self._transaction() as connection:
+            connection.execute(
+                'DELETE FROM refreshing WHERE zone = ? AND started < ?',
+                (zone, now - self.lock_timeout))
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO refreshing (zone, owner, started) '
+                'VALUES (?, ?, ?)',
+                (zone, self._owner(), now))
+            return cursor.rowcount == 1
+
+    def _release(self, zone):
+        self._connect().execute(
+            'DELETE FROM refreshing WHERE zone = ? AND owner = ?',
+            (zone, self._owner()))
+
+    def invalidate(self, zone=None):
+        """
+        Remove a zone, or all zones, from the cache.
+
+        Keyword Args:
+            zone (str): The zone, or `None` for all zones.
+
+        """
+        if zone is None:
+            self._connect().execute('DELETE FROM zones')
+        else:
+            self._connect().execute(
+                'DELETE FROM zones WHERE zone = ?',
+                (zone.lower(),))
+
+    def warm(
+            self,
+            client,
+            zones,
+            workers=10):
+        """
+        Fill the cache for many zones concurrently.
+
+        Zones which are fresh are not fetched again. Every zone is fetched
+        using its own connection to the database, which is closed when the
+        zone is done, so that worker threads don't leave connections open.
+
+        Args:
+            client (RRPproxy): The client to fetch the zones with.
+            zones (iterable): The zones.
+
+        Keyword Args:
+            workers (int): The number of concurrent calls.
+
+        Yields:
+            Result: The result for every zone, the input being the zone.
+
+        """
+        def get(zone):
+            try:
+                return self.get(client, zone)
+            finally:
+                self.close()
+
+        return bulk.fan_out(get, zones, workers=workers)
+
+    def __len__(self):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM zones').fetchone()[0]
+
+
+class _Transaction:
+    """
+    Run statements on a connection in an immediate transaction.
+
+    The database is locked for writing at the start of the transaction, so
+    a claim is checked and made atomically.
+
+    """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.connection.execute('COMMIT')
+        else:
+            self.connection.execute('ROLLBACK')
@@ -23,6 +23,16 @@ setup(
     install_requires=[
         'requests >= 2.21.0',
     ],
+    entry_points={
+        'console_scripts': [
+            'rrpproxy = rrpproxypy.cli:main',
+        ],
+    },
+    extras_require={
+        'async': [
+            'aiohttp >= 3.5.0',
+        ],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
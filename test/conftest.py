@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+
+# The benchmarks share the configparser based reference parser with the
+# parser tests.
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+    'benchmarks'))
+
+
+class Clock:
+    """
+    A clock which only moves when told to, or when sleeping.
+
+    """
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.time += seconds
+
+
+@pytest.fixture
+def clock():
+    """
+    A fake clock, starting at 0.
+
+    """
+    return Clock()
@@ -0,0 +1,147 @@
+import asyncio
+
+from aiohttp import web
+
+import pytest
+
+from rrpproxypy import aio
+from rrpproxypy import exceptions
+
+
+STATUS_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 200\n'
+    'description = Command completed successfully\n'
+    'queuetime = 0\n'
+    'runtime = 0.001\n'
+    'property[domain][0] = {domain}\n'
+    'property[status][0] = ACTIVE\n'
+    'EOF\n')
+
+FAILURE_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 541\n'
+    'description = Invalid attribute value\n'
+    'queuetime = 0\n'
+    'runtime = 0.001\n'
+    'property[zone][0] = com\n'
+    'EOF\n')
+
+
+async def start_server(state):
+    """
+    Start a local stand-in for the RRP API.
+
+    The stand-in keeps track of the number of requests in flight.
+
+    """
+    async def call(request):
+        state['in_flight'] += 1
+        state['max_in_flight'] = max(
+            state['max_in_flight'],
+            state['in_flight'])
+        await asyncio.sleep(0.01)
+        state['in_flight'] -= 1
+        state['queries'].append(dict(request.query))
+        if request.query['command'] == 'DomainPrice':
+            return web.Response(text=FAILURE_RESPONSE)
+        return web.Response(text=STATUS_RESPONSE.format(
+            domain=request.query.get('domain', '')))
+
+    app = web.Application()
+    app.router.add_get('/api/call', call)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, 'http://127.0.0.1:{}/'.format(port)
+
+
+@pytest.fixture
+def state():
+    """
+    The state of the stand-in server.
+
+    """
+    return {
+        'in_flight': 0,
+        'max_in_flight': 0,
+        'queries': [],
+    }
+
+
+def test_status_domain(
+        state):
+    """
+    Test if the status domain command can be awaited.
+
+    """
+    async def main():
+        runner, url = await start_server(state)
+        async with aio.AsyncRRPproxy(
+                'username',
+                'password',
+                url=url) as client:
+            response = await client.status_domain('example.com')
+        await runner.cleanup()
+        return response
+
+    response = asyncio.get_event_loop().run_until_complete(main())
+    assert response['properties'] == {
+        'domain': 'example.com',
+        'status': 'ACTIVE',
+    }
+    assert state['queries'] == [{
+        's_login': 'username',
+        's_pw': 'password',
+        'command': 'StatusDomain',
+        'domain': 'example.com',
+    }]
+
+
+def test_concurrency_is_bounded(
+        state):
+    """
+    Test if no more than the configured number of requests are in flight.
+
+    """
+    async def main():
+        runner, url = await start_server(state)
+        async with aio.AsyncRRPproxy(
+                'username',
+                'password',
+                url=url,
+                concurrency=5) as client:
+            responses = await asyncio.gather(*(
+                client.status_domain('example{}.com'.format(i))
+                for i in range(50)))
+        await runner.cleanup()
+        return responses
+
+    responses = asyncio.get_event_loop().run_until_complete(main())
+    assert [
+        response['properties']['domain'] for response in responses
+    ] == ['example{}.com'.format(i) for i in range(50)]
+    assert state['max_in_flight'] == 5
+
+
+def test_domain_price_failure(
+        state):
+    """
+    Test if a failing domain price command raises a failure.
+
+    """
+    async def main():
+        runner, url = await start_server(state)
+        try:
+            async with aio.AsyncRRPproxy(
+                    'username',
+                    'password',
+                    url=url) as client:
+                await client.domain_price('example.com')
+        finally:
+            await runner.cleanup()
+
+    with pytest.raises(exceptions.Failure):
+        asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,135 @@
+from urllib import parse
+from unittest import mock
+import threading
+import time
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import bulk
+
+
+STATUS_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 200\n'
+    'description = Command completed successfully\n'
+    'queuetime = 0\n'
+    'runtime = 0.001\n'
+    'property[domain][0] = {domain}\n'
+    'EOF\n')
+
+
+def fake_get(url, **kwargs):
+    """
+    Answer a StatusDomain call like the API would.
+
+    Calls for `fail.com` raise a connection error.
+
+    """
+    query = dict(parse.parse_qsl(parse.urlparse(url).query))
+    if query['domain'] == 'fail.com':
+        raise ConnectionError('Connection refused')
+    return mock.Mock(text=STATUS_RESPONSE.format(domain=query['domain']))
+
+
+@pytest.fixture
+def client():
+    """
+    An RRPproxy client which doesn't connect to the API.
+
+    """
+    client = rrpproxypy.RRPproxy('username', 'password')
+    client.session.get = mock.Mock(side_effect=fake_get)
+    return client
+
+
+def test_fan_out_yields_every_item():
+    """
+    Test if every item is yielded exactly once with its result.
+
+    """
+    results = list(bulk.fan_out(lambda item: item * 2, range(100), workers=4))
+    assert sorted(
+        (result.input, result.response) for result in results
+    ) == [(item, item * 2) for item in range(100)]
+
+
+def test_fan_out_is_concurrent():
+    """
+    Test if the calls are spread over the workers.
+
+    """
+    threads = set()
+    lock = threading.Lock()
+
+    def function(item):
+        with lock:
+            threads.add(threading.get_ident())
+        time.sleep(0.01)
+
+    list(bulk.fan_out(function, range(20), workers=5))
+    assert len(threads) == 5
+
+
+def test_request_many(
+        client):
+    """
+    Test if many requests can be performed at once.
+
+    """
+    commands = [
+        ('StatusDomain', {'domain': 'example{}.com'.format(i)})
+        for i in range(10)]
+    results = list(client.request_many(commands, workers=3))
+    assert len(results) == 10
+    for result in results:
+        assert result.error is None
+        assert result.response['properties']['domain'] == (
+            result.input[1]['domain'])
+
+
+def test_status_domains_failure_does_not_abort(
+        client):
+    """
+    Test if a failing domain doesn't abort the batch.
+
+    """
+    results = {
+        result.input: result
+        for result in client.status_domains(
+            ['example.com', 'fail.com', 'example.org'])}
+    assert results['example.com'].response['properties']['domain'] == (
+        'example.com')
+    assert results['example.org'].error is None
+    assert results['fail.com'].response is None
+    assert isinstance(results['fail.com'].error, ConnectionError)
+
+
+def test_chunked():
+    """
+    Test if items are split into chunks of the current size.
+
+    """
+    sizes = iter([2, 3, 10, 10])
+    assert list(bulk.chunked(range(7), lambda: next(sizes))) == [
+        [0, 1], [2, 3, 4], [5, 6]]
+    assert list(bulk.chunked([], lambda: 5)) == []
+
+
+def test_chunk_sizer():
+    """
+    Test if the chunk size follows the server runtime.
+
+    """
+    sizer = bulk.ChunkSizer(32, target_runtime=1.0)
+    sizer.observe(32, 4.0)
+    assert sizer.size == 8
+    sizer.observe(8, 0.6)
+    assert sizer.size == 8
+    sizer.observe(8, 0.1)
+    assert sizer.size == 16
+    sizer.observe(16, 0.1)
+    sizer.observe(32, 0.1)
+    assert sizer.size == 32
+    sizer.observe(32, 100.0)
+    assert sizer.size == 1
@@ -0,0 +1,176 @@
+from unittest import mock
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import cache
+
+
+ZONE_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 200\n'
+    'description = Command completed successfully\n'
+    'property[zone][0] = com\n'
+    'EOF\n')
+
+
+@pytest.fixture
+def ttl_cache(clock):
+    """
+    A cache with a short TTL for GetZoneInfo.
+
+    """
+    return cache.TTLCache(
+        ttls={'GetZoneInfo': 10},
+        maxsize=2,
+        clock=clock)
+
+
+def test_key_is_normalized():
+    """
+    Test if keys ignore the case of commands and the order of arguments.
+
+    """
+    assert cache.make_key('GetZoneInfo', {'zone': 'com', 'A': 1}) == (
+        cache.make_key('getzoneinfo', {'a': '1', 'zone': 'com'}))
+
+
+def test_expiry(
+        ttl_cache,
+        clock):
+    """
+    Test if responses expire after their TTL.
+
+    """
+    ttl_cache.set('GetZoneInfo', {'zone': 'com'}, 'response')
+    clock.time = 9
+    assert ttl_cache.get('GetZoneInfo', {'zone': 'com'}) == 'response'
+    clock.time = 10
+    assert ttl_cache.get('GetZoneInfo', {'zone': 'com'}) is None
+    assert (ttl_cache.hits, ttl_cache.misses) == (1, 1)
+
+
+def test_lru_eviction(
+        ttl_cache):
+    """
+    Test if the least recently used response is evicted.
+
+    """
+    ttl_cache.set('GetZoneInfo', {'zone': 'com'}, 'com')
+    ttl_cache.set('GetZoneInfo', {'zone': 'net'}, 'net')
+    ttl_cache.get('GetZoneInfo', {'zone': 'com'})
+    ttl_cache.set('GetZoneInfo', {'zone': 'org'}, 'org')
+    assert len(ttl_cache) == 2
+    assert ttl_cache.get('GetZoneInfo', {'zone': 'net'}) is None
+    assert ttl_cache.get('GetZoneInfo', {'zone': 'com'}) == 'com'
+
+
+def test_invalidate(
+        ttl_cache):
+    """
+    Test if single calls, commands and the whole cache can be invalidated.
+
+    """
+    ttl_cache.set('GetZoneInfo', {'zone': 'com'}, 'com')
+    ttl_cache.set('GetZoneInfo', {'zone': 'net'}, 'net')
+    ttl_cache.invalidate('GetZoneInfo', zone='com')
+    assert ttl_cache.get('GetZoneInfo', {'zone': 'com'}) is None
+    assert ttl_cache.get('GetZoneInfo', {'zone': 'net'}) == 'net'
+    ttl_cache.invalidate('getzoneinfo')
+    assert len(ttl_cache) == 0
+    ttl_cache.set('GetZoneInfo', {'zone': 'com'}, 'com')
+    ttl_cache.invalidate()
+    assert len(ttl_cache) == 0
+
+
+@pytest.fixture
+def client(ttl_cache):
+    """
+    An RRPproxy client with a cache which doesn't connect to the API.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        cache=ttl_cache)
+    client.session.get = mock.Mock(
+        return_value=mock.Mock(text=ZONE_RESPONSE))
+    return client
+
+
+def test_client_caches_read_only_commands(
+        client):
+    """
+    Test if a read-only command is only requested once.
+
+    """
+    first = client.get_zone_info('com')
+    second = client.get_zone_info('com')
+    assert first is second
+    assert client.session.get.call_count == 1
+    assert client.cache.hits == 1
+
+
+def test_client_bypasses_cache_for_other_commands(
+        client):
+    """
+    Test if commands without a TTL are always requested.
+
+    """
+    client.request('ModifyDomain', domain='example.com')
+    client.request('ModifyDomain', domain='example.com')
+    assert client.session.get.call_count == 2
+    assert (client.cache.hits, client.cache.misses) == (0, 0)
+
+
+def test_client_does_not_cache_errors(
+        client):
+    """
+    Test if failed responses are not cached.
+
+    """
+    client.session.get.return_value = mock.Mock(
+        text='[RESPONSE]\ncode = 545\ndescription = Not found\nEOF\n')
+    client.get_zone_info('invalid')
+    client.get_zone_info('invalid')
+    assert client.session.get.call_count == 2
+
+
+def test_client_never_caches_mutating_commands(
+        clock):
+    """
+    Test if mutating commands bypass the cache even when they have a TTL.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        cache=cache.TTLCache(ttls={'RenewDomain': 10}, clock=clock))
+    client.session.get = mock.Mock(
+        return_value=mock.Mock(text=ZONE_RESPONSE))
+    client.request('RenewDomain', domain='example.com')
+    client.request('RenewDomain', domain='example.com')
+    assert client.session.get.call_count == 2
+    assert len(client.cache) == 0
+
+
+def test_cache_is_scoped_by_account(
+        client,
+        ttl_cache):
+    """
+    Test if clients of different accounts sharing a cache don't mix up
+    responses.
+
+    """
+    other = rrpproxypy.RRPproxy(
+        'other',
+        'password',
+        cache=ttl_cache)
+    other.session.get = mock.Mock(
+        return_value=mock.Mock(text=ZONE_RESPONSE))
+    client.get_zone_info('com')
+    other.get_zone_info('com')
+    assert client.session.get.call_count == 1
+    assert other.session.get.call_count == 1
+    ttl_cache.invalidate('GetZoneInfo', zone='com')
+    assert len(ttl_cache) == 0
@@ -0,0 +1,147 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from rrpproxypy import cli
+from rrpproxypy import standin
+
+
+@pytest.fixture
+def server():
+    """
+    A running stand-in server.
+
+    """
+    with standin.StandInServer() as server:
+        yield server
+
+
+def run(server, *args, stdin=''):
+    """
+    Run the command against the stand-in and capture its output.
+
+    """
+    output = io.StringIO()
+    arguments = [
+        '--rrpproxy-username', 'username',
+        '--rrpproxy-password', 'password',
+        '--url', server.url,
+    ] + list(args)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(sys, 'stdin', io.StringIO(stdin))
+        monkeypatch.setattr(sys, 'stdout', output)
+        status = cli.main(arguments)
+    return status, output.getvalue()
+
+
+def test_read_jobs():
+    """
+    Test if jobs are numbered by line and invalid lines are reported.
+
+    """
+    jobs = list(cli.read_jobs([
+        '{"command": "StatusDomain", "args": {"domain": "a.com"}}\n',
+        '\n',
+        '{"command": "GetZoneInfo"}\n',
+        'not json\n',
+        '{"args": {}}\n',
+    ]))
+    assert jobs[:2] == [
+        (1, 'StatusDomain', {'domain': 'a.com'}),
+        (3, 'GetZoneInfo', {}),
+    ]
+    assert [(number, command) for number, command, _ in jobs[2:]] == [
+        (4, None), (5, None)]
+    assert isinstance(jobs[2][2], ValueError)
+
+
+def test_call(
+        server):
+    """
+    Test if a single call prints the response.
+
+    """
+    status, output = run(server, 'call', 'StatusDomain', 'domain=domain3.com')
+    assert status == 0
+    assert json.loads(output)['properties']['domain'] == 'domain3.com'
+    status, output = run(server, 'call', 'StatusDomain', 'domain=x.com')
+    assert status == 1
+
+
+def test_batch(
+        server):
+    """
+    Test if a batch streams a result per line.
+
+    """
+    lines = [
+        json.dumps({'command': 'StatusDomain', 'args': {'domain': domain}})
+        for domain in ['domain{}.com'.format(i) for i in range(0, 30, 3)]]
+    lines.insert(2, '{"broken"')
+    status, output = run(
+        server,
+        'batch',
+        '--workers', '4',
+        '--rate', '1000',
+        stdin='\n'.join(lines) + '\n')
+    assert status == 1
+    results = {
+        result['line']: result
+        for result in map(json.loads, output.splitlines())}
+    assert sorted(results) == list(range(1, 12))
+    assert 'error' in results[3]
+    assert results[1]['response']['properties']['domain'] == 'domain0.com'
+    assert results[11]['args'] == {'domain': 'domain27.com'}
+
+
+def test_batch_status(
+        server):
+    """
+    Test if a batch fails when a call returns an error code.
+
+    """
+    def batch(*domains):
+        lines = [
+            json.dumps({'command': 'StatusDomain', 'args': {'domain': domain}})
+            for domain in domains]
+        return run(server, 'batch', stdin='\n'.join(lines) + '\n')[0]
+
+    assert batch('domain0.com', 'domain1.net') == 0
+    assert batch('unknown.com', 'other.com') == 1
+
+
+def test_help_does_not_import_requests():
+    """
+    Test if the command starts without importing requests.
+
+    """
+    code = (
+        'import sys\n'
+        'from rrpproxypy import cli\n'
+        'try:\n'
+        '    cli.main(["--help"])\n'
+        'except SystemExit:\n'
+        '    pass\n'
+        'assert "requests" not in sys.modules\n')
+    subprocess.run(
+        [sys.executable, '-c', code],
+        check=True,
+        stdout=subprocess.DEVNULL)
+
+
+def test_warm_zones(
+        server,
+        tmp_path):
+    """
+    Test if zones are cached and reported.
+
+    """
+    path = str(tmp_path / 'zones.sqlite')
+    status, output = run(server, 'warm-zones', path, 'com', 'net')
+    assert status == 0
+    results = [json.loads(line) for line in output.splitlines()]
+    assert sorted(result['zone'] for result in results) == ['com', 'net']
+    assert all('fetched' in result for result in results)
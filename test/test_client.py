@@ -1,4 +1,7 @@
+from urllib import parse
+import argparse
 import os
+import time
 from unittest import mock
 
 import pytest
@@ -189,3 +192,380 @@ def test_status_domain(
         'queuetime': '0',
         'runtime': mock.ANY,
     }
+
+
+STATUS_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 200\n'
+    'description = Command completed successfully\n'
+    'queuetime = 0\n'
+    'runtime = 0.001\n'
+    'property[domain][0] = example.com\n'
+    'property[status][0] = ACTIVE\n'
+    'EOF\n')
+
+
+@pytest.fixture
+def offline_client():
+    """
+    An RRPproxy client which doesn't connect to the API.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        username='username',
+        password='password',
+        timeout=5)
+    client.session.get = mock.Mock(
+        return_value=mock.Mock(text=STATUS_RESPONSE))
+    return client
+
+
+def test_request_uses_pooled_session(
+        offline_client):
+    """
+    Test if requests go through the pooled session with the timeout.
+
+    """
+    response = offline_client.status_domain('example.com')
+    assert response['properties'] == {
+        'domain': 'example.com',
+        'status': 'ACTIVE',
+    }
+    offline_client.session.get.assert_called_once_with(
+        mock.ANY,
+        timeout=5)
+
+
+def test_pool_size():
+    """
+    Test if the connection pool size can be configured.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        pool_maxsize=32)
+    adapter = client.session.get_adapter('https://api.rrpproxy.net/')
+    assert adapter._pool_maxsize == 32
+
+
+def test_context_manager_closes_session():
+    """
+    Test if leaving the context manager closes the connections.
+
+    """
+    with rrpproxypy.RRPproxy('username', 'password') as client:
+        client.session.close = mock.Mock()
+    client.session.close.assert_called_once_with()
+
+
+def domain_list_get(domains):
+    """
+    Answer paged QueryDomainList calls for the given domains.
+
+    """
+    def get(url, **kwargs):
+        query = dict(parse.parse_qsl(parse.urlparse(url).query))
+        first = int(query['first'])
+        page = domains[first:first + int(query['limit'])]
+        lines = [
+            '[RESPONSE]',
+            'code = 200',
+            'description = Command completed successfully',
+            'property[column][0] = domain',
+            'property[column][1] = domain zone',
+            'property[count][0] = {}'.format(len(page)),
+            'property[first][0] = {}'.format(first),
+            'property[total][0] = {}'.format(len(domains)),
+        ]
+        for index, domain in enumerate(page):
+            lines.append('property[domain][{}] = {}'.format(index, domain))
+            lines.append('property[domain zone][{}] = {}'.format(
+                index,
+                domain.split('.')[-1]))
+        lines.append('EOF')
+        return mock.Mock(text='\n'.join(lines))
+    return get
+
+
+@pytest.mark.parametrize('total', [0, 1, 10, 11, 25])
+def test_iter_domains(
+        offline_client,
+        total):
+    """
+    Test if all domains are yielded, one record per domain.
+
+    """
+    domains = ['example{}.com'.format(i) for i in range(total)]
+    offline_client.session.get.side_effect = domain_list_get(domains)
+    records = list(offline_client.iter_domains(page_size=5))
+    assert records == [
+        {'domain': domain, 'domain zone': 'com'} for domain in domains]
+    assert offline_client.session.get.call_count == max(1, -(-total // 5))
+
+
+def test_iter_domains_filters(
+        offline_client):
+    """
+    Test if filters are passed on to QueryDomainList.
+
+    """
+    offline_client.session.get.side_effect = domain_list_get([])
+    list(offline_client.iter_domains(zone='com'))
+    url = offline_client.session.get.call_args[0][0]
+    query = dict(parse.parse_qsl(parse.urlparse(url).query))
+    assert query['zone'] == 'com'
+    assert query['limit'] == '1000'
+    assert query['orderby'] == 'DOMAINREGISTRATIONEXPIRATIONDATE'
+
+
+class SessionAPI:
+    """
+    A fake API handing out sessions, which can be expired.
+
+    """
+    def __init__(self):
+        self.sessions = 0
+        self.valid = set()
+        self.queries = []
+
+    def get(self, url, **kwargs):
+        query = dict(parse.parse_qsl(parse.urlparse(url).query))
+        self.queries.append(query)
+        if query['command'] == 'StartSession':
+            self.sessions += 1
+            session_id = 'session{}'.format(self.sessions)
+            self.valid.add(session_id)
+            text = (
+                '[RESPONSE]\ncode = 200\ndescription = OK\n'
+                'property[sessionid][0] = {}\nEOF\n').format(session_id)
+        elif query.get('s_sessionid') not in self.valid:
+            text = '[RESPONSE]\ncode = 530\ndescription = Denied\nEOF\n'
+        elif query['command'] == 'EndSession':
+            self.valid.remove(query['s_sessionid'])
+            text = '[RESPONSE]\ncode = 200\ndescription = OK\nEOF\n'
+        else:
+            text = STATUS_RESPONSE
+        return mock.Mock(text=text)
+
+
+@pytest.fixture
+def session_api(
+        offline_client):
+    """
+    A fake session API used by the offline client in session mode.
+
+    """
+    api = SessionAPI()
+    offline_client.session.get.side_effect = api.get
+    offline_client.login_session = True
+    return api
+
+
+def test_login_session(
+        offline_client,
+        session_api):
+    """
+    Test if only the session id is sent after logging in.
+
+    """
+    offline_client.status_domain('example.com')
+    offline_client.status_domain('example.com')
+    assert [query['command'] for query in session_api.queries] == [
+        'StartSession',
+        'StatusDomain',
+        'StatusDomain',
+    ]
+    assert session_api.queries[0]['s_pw'] == 'password'
+    assert session_api.queries[-1] == {
+        's_sessionid': 'session1',
+        'command': 'StatusDomain',
+        'domain': 'example.com',
+    }
+
+
+def test_login_session_renewed(
+        offline_client,
+        session_api):
+    """
+    Test if an expired session is renewed transparently.
+
+    """
+    offline_client.status_domain('example.com')
+    session_api.valid.clear()
+    response = offline_client.status_domain('example.com')
+    assert response['code'] == '200'
+    assert offline_client.session_id == 'session2'
+
+
+def test_login_session_ended_on_close(
+        offline_client,
+        session_api):
+    """
+    Test if the session is ended when the client is closed.
+
+    """
+    offline_client.status_domain('example.com')
+    offline_client.close()
+    assert session_api.queries[-1]['command'] == 'EndSession'
+    assert session_api.valid == set()
+
+
+def test_from_args():
+    """
+    Test if a client can be created from command line arguments.
+
+    """
+    parser = argparse.ArgumentParser()
+    rrpproxypy.add_arguments(parser)
+    args = parser.parse_args([
+        '--rrpproxy-username', 'username',
+        '--rrpproxy-password', 'password',
+        '--rrpproxy-test'])
+    client = rrpproxypy.RRPproxy.from_args(args, login_session=True)
+    assert client.username == 'username'
+    assert client.url == 'https://api-ote.rrpproxy.net/'
+    assert client.login_session
+
+
+def test_iter_domains_typed(
+        offline_client):
+    """
+    Test if typed domains are decoded.
+
+    """
+    offline_client.session.get.side_effect = domain_list_get(['a.com'])
+    records = list(offline_client.iter_domains(typed=True))
+    assert records == [{'domain': 'a.com', 'domain zone': 'com'}]
+
+
+def test_request_posts_large_arguments(
+        offline_client):
+    """
+    Test if calls with long URLs are sent as a POST form body.
+
+    """
+    offline_client.session.post = mock.Mock(
+        return_value=mock.Mock(text=STATUS_RESPONSE))
+    offline_client.status_domain('example.com')
+    assert not offline_client.session.post.called
+    domains = {
+        'domain{}'.format(i): 'example{}.com'.format(i) for i in range(200)}
+    offline_client.request('CheckDomains', **domains)
+    url, = offline_client.session.post.call_args[0]
+    kwargs = offline_client.session.post.call_args[1]
+    assert url == 'https://api.rrpproxy.net/api/call'
+    data = dict(parse.parse_qsl(kwargs['data']))
+    assert data['command'] == 'CheckDomains'
+    assert data['domain199'] == 'example199.com'
+    assert kwargs['headers'] == rrpproxypy.client.FORM_HEADERS
+    assert kwargs['timeout'] == 5
+
+
+def test_read_only_calls_are_retried(
+        offline_client):
+    """
+    Test if read-only calls are retried on connection errors and 421.
+
+    """
+    offline_client.retries = 2
+    offline_client.backoff = 0.001
+    ok = mock.Mock(text=STATUS_RESPONSE)
+    temporary = mock.Mock(text=STATUS_RESPONSE.replace('200', '421', 1))
+    offline_client.session.get.side_effect = [
+        ConnectionError('reset'),
+        temporary,
+        ok,
+    ]
+    assert offline_client.status_domain('example.com')['code'] == '200'
+    assert offline_client.session.get.call_count == 3
+
+    offline_client.session.get.reset_mock()
+    offline_client.session.get.side_effect = [temporary] * 3
+    assert offline_client.status_domain('example.com')['code'] == '421'
+    assert offline_client.session.get.call_count == 3
+
+
+def test_mutating_calls_are_not_retried(
+        offline_client):
+    """
+    Test if calls which may change something are never retried.
+
+    """
+    offline_client.retries = 2
+    offline_client.session.get.side_effect = ConnectionError('reset')
+    with pytest.raises(ConnectionError):
+        offline_client.request('RenewDomain', domain='example.com')
+    assert offline_client.session.get.call_count == 1
+
+
+def test_hedged_calls(
+        offline_client):
+    """
+    Test if a slow read-only call is hedged by a second call.
+
+    """
+    offline_client.hedge_percentile = 90
+    for _ in range(rrpproxypy.client.HEDGE_MIN_SAMPLES):
+        offline_client.latencies.add(0.01)
+    replies = iter([(0.2, None), (0.0, mock.Mock(text=STATUS_RESPONSE))])
+
+    def get(url, **kwargs):
+        delay, reply = next(replies)
+        time.sleep(delay)
+        if reply is None:
+            raise ConnectionError('reset')
+        return reply
+
+    offline_client.session.get.side_effect = get
+    assert offline_client.status_domain('example.com')['code'] == '200'
+    assert offline_client.hedged == 1
+    assert offline_client.session.get.call_count == 2
+    offline_client.close()
+
+
+def test_slow_call_is_overtaken_by_hedge(
+        offline_client):
+    """
+    Test if the reply of a hedge is used when it arrives before the reply
+    of a slow call.
+
+    """
+    offline_client.hedge_percentile = 90
+    for _ in range(rrpproxypy.client.HEDGE_MIN_SAMPLES):
+        offline_client.latencies.add(0.01)
+    delays = iter([1.0, 0.0])
+
+    def get(url, **kwargs):
+        time.sleep(next(delays))
+        return mock.Mock(text=STATUS_RESPONSE)
+
+    offline_client.session.get.side_effect = get
+    started = time.perf_counter()
+    assert offline_client.status_domain('example.com')['code'] == '200'
+    assert time.perf_counter() - started < 0.5
+    assert offline_client.hedged == 1
+    assert offline_client.session.get.call_count == 2
+    offline_client.close()
+
+
+def test_hedges_are_limited_by_budget(
+        offline_client):
+    """
+    Test if no more calls are hedged than the budget allows.
+
+    """
+    offline_client.hedge_percentile = 90
+    offline_client.hedge_budget = 0
+    for _ in range(rrpproxypy.client.HEDGE_MIN_SAMPLES):
+        offline_client.latencies.add(0.01)
+
+    def get(url, **kwargs):
+        time.sleep(0.1)
+        return mock.Mock(text=STATUS_RESPONSE)
+
+    offline_client.session.get.side_effect = get
+    assert offline_client.status_domain('example.com')['code'] == '200'
+    assert offline_client.hedged == 0
+    assert offline_client.session.get.call_count == 1
+    offline_client.close()
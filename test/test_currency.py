@@ -0,0 +1,123 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from rrpproxypy import currency
+from rrpproxypy import exceptions
+from rrpproxypy import parser
+
+
+RATES_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 200\n'
+    'description = Command completed successfully\n'
+    'property[currency from][0] = EUR\n'
+    'property[currency from][1] = EUR\n'
+    'property[currency to][0] = USD\n'
+    'property[currency to][1] = GBP\n'
+    'property[rate][0] = 1.1400\n'
+    'property[rate][1] = 0.8800\n'
+    'EOF\n')
+
+CONVERT_RESPONSE = (
+    '[RESPONSE]\n'
+    'code = 200\n'
+    'description = Command completed successfully\n'
+    'property[converted amount][0] = {}\n'
+    'EOF\n')
+
+
+@pytest.fixture
+def client():
+    """
+    A mocked RRPproxy client.
+
+    """
+    client = mock.Mock()
+    client.query_exchange_rates.return_value = parser.parse_response(
+        RATES_RESPONSE)
+    client.convert_currency.return_value = parser.parse_response(
+        CONVERT_RESPONSE.format('99.99'))
+    return client
+
+
+@pytest.fixture
+def converter(
+        client,
+        clock):
+    """
+    A currency converter using the mocked client.
+
+    """
+    return currency.CurrencyConverter(
+        client,
+        max_age=60,
+        clock=clock)
+
+
+def test_convert_from_base(
+        converter):
+    """
+    Test if amounts are converted from the base currency.
+
+    """
+    assert converter.convert(Decimal('100'), 'EUR', 'USD') == Decimal(
+        '114.00')
+
+
+def test_convert_cross_rate(
+        converter):
+    """
+    Test if amounts are converted between two non-base currencies.
+
+    """
+    assert converter.convert(Decimal('114'), 'USD', 'GBP') == Decimal(
+        '88.00')
+
+
+def test_convert_many_loads_rates_once(
+        converter,
+        client,
+        clock):
+    """
+    Test if the rates are loaded once and reloaded when they are too old.
+
+    """
+    assert converter.convert_many([1, 2, '3.50'], 'EUR', 'GBP') == [
+        Decimal('0.88'),
+        Decimal('1.76'),
+        Decimal('3.08'),
+    ]
+    converter.convert(1, 'EUR', 'USD')
+    assert client.query_exchange_rates.call_count == 1
+    clock.time = 60
+    converter.convert(1, 'EUR', 'USD')
+    assert client.query_exchange_rates.call_count == 2
+    client.convert_currency.assert_not_called()
+
+
+def test_unknown_currency_falls_back_to_api(
+        converter,
+        client):
+    """
+    Test if currencies without a local rate are converted by the API.
+
+    """
+    assert converter.convert(100, 'EUR', 'JPY') == Decimal('99.99')
+    client.convert_currency.assert_called_once_with(100, 'EUR', 'JPY')
+
+
+def test_verify(
+        converter,
+        client):
+    """
+    Test if verifying compares the local and API amounts.
+
+    """
+    client.convert_currency.return_value = parser.parse_response(
+        CONVERT_RESPONSE.format('114.00'))
+    assert converter.convert(100, 'EUR', 'USD', verify=True) == Decimal(
+        '114.00')
+    with pytest.raises(exceptions.ConversionMismatch):
+        converter.convert(101, 'EUR', 'USD', verify=True)
@@ -0,0 +1,90 @@
+from decimal import Decimal
+import datetime
+from unittest import mock
+
+import pytest
+
+from rrpproxypy import fields
+from rrpproxypy import parser
+from rrpproxypy import standin
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2019-02-19 12:34:56', datetime.datetime(2019, 2, 19, 12, 34, 56)),
+    ('2019-02-30 12:34:56', '2019-02-30 12:34:56'),
+    ('2019-02-19T12:34:56', '2019-02-19T12:34:56'),
+    ('2019-02-19', '2019-02-19'),
+    ('', ''),
+])
+def test_parse_datetime(
+        value,
+        expected):
+    """
+    Test if datetimes are parsed like strptime, leaving other values.
+
+    """
+    assert fields.parse_datetime(value) == expected
+
+
+def test_decode_response():
+    """
+    Test if response values and properties are decoded by field.
+
+    """
+    response = fields.decode(parser.parse_response(standin.format_response(
+        200,
+        'Command completed successfully',
+        {
+            'price': ['9.5000', ''],
+            'currency': 'USD',
+            'registration expiration date': '2020-01-01 00:00:00',
+            'period': '1',
+        },
+        runtime=0.25)))
+    assert response['code'] == 200
+    assert response['runtime'] == 0.25
+    assert response['description'] == 'Command completed successfully'
+    properties = response['properties']
+    assert list(properties['price']) == [Decimal('9.5'), '']
+    assert properties['currency'] == 'USD'
+    assert properties['registration expiration date'] == datetime.datetime(
+        2020, 1, 1)
+    assert properties['period'] == 1
+    assert properties['price'] is properties['price']
+
+
+def test_decode_lazily():
+    """
+    Test if values are only decoded when read, and only once.
+
+    """
+    decoder = mock.Mock(side_effect=int)
+    values = fields.LazyList(['1', '2', '3'], decoder)
+    assert values[1] == 2
+    assert values[1] == 2
+    assert decoder.call_count == 1
+    assert values[-1] == 3
+    assert values[:2] == [1, 2]
+    assert decoder.call_count == 3
+
+
+def test_typed_rows():
+    """
+    Test if typed rows decode their values.
+
+    """
+    domains = standin.make_domains(3)
+    properties = {'column': list(standin.DOMAIN_COLUMNS)}
+    for column in standin.DOMAIN_COLUMNS:
+        properties[column] = [domain[column] for domain in domains]
+    response = fields.decode(parser.parse_response(
+        standin.format_response(200, 'OK', properties)))
+    rows = response.rows()
+    assert len(rows) == 3
+    assert rows[-1]['domain'] == 'domain2.org'
+    assert rows[0]['domain created date'] == datetime.datetime(2019, 1, 1)
+    assert [row['domain'] for row in rows[1:]] == [
+        'domain1.net', 'domain2.org']
+    assert dict(rows[0])['domain zone'] == 'com'
+    with pytest.raises(IndexError):
+        rows[3]
@@ -0,0 +1,99 @@
+from unittest import mock
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import metrics
+
+
+def test_histogram_percentiles():
+    """
+    Test if percentiles are estimated within the bucket precision.
+
+    """
+    histogram = metrics.Histogram()
+    for value in range(1, 1001):
+        histogram.add(value / 1000)
+    summary = histogram.summary()
+    assert summary['count'] == 1000
+    assert summary['mean'] == pytest.approx(0.5005)
+    assert summary['max'] == 1.0
+    assert summary['p50'] == pytest.approx(0.5, rel=0.02)
+    assert summary['p90'] == pytest.approx(0.9, rel=0.02)
+    assert summary['p99'] == pytest.approx(0.99, rel=0.02)
+
+
+def test_histogram_empty():
+    """
+    Test if an empty histogram has no percentiles.
+
+    """
+    assert metrics.Histogram().percentile(50) is None
+
+
+def test_histograms_per_command():
+    """
+    Test if timings are aggregated per command and phase.
+
+    """
+    histograms = metrics.Histograms()
+    histograms(metrics.Timing('StatusDomain', 0.001, 0.1, 0.002, 0.05, None))
+    histograms(metrics.Timing('GetZoneInfo', 0.001, 0.2, 0.002, 0.1, 0.0))
+    summary = histograms.summary()
+    assert set(summary['StatusDomain']) == {
+        'build',
+        'http',
+        'parse',
+        'runtime',
+    }
+    assert summary['GetZoneInfo']['queuetime']['count'] == 1
+    assert summary['GetZoneInfo']['http']['max'] == 0.2
+
+
+def test_client_emits_timings():
+    """
+    Test if the client times every call when there are hooks.
+
+    """
+    hook = mock.Mock()
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        timing_hooks=[hook])
+    client.session.get = mock.Mock(return_value=mock.Mock(text=(
+        '[RESPONSE]\n'
+        'code = 200\n'
+        'description = Command completed successfully\n'
+        'queuetime = 0\n'
+        'runtime = 0.042\n'
+        'EOF\n')))
+    client.status_domain('example.com')
+    timing = hook.call_args[0][0]
+    assert timing.command == 'StatusDomain'
+    assert timing.runtime == 0.042
+    assert timing.queuetime == 0.0
+    assert timing.build >= 0
+    assert timing.http >= 0
+    assert timing.parse >= 0
+
+
+def test_windowed_histogram():
+    """
+    Test if a windowed histogram forgets values older than two windows.
+
+    """
+    now = [0.0]
+    histogram = metrics.WindowedHistogram(window=10, clock=lambda: now[0])
+    for _ in range(10):
+        histogram.add(1.0)
+    now[0] = 15
+    for _ in range(10):
+        histogram.add(0.01)
+    assert histogram.count == 20
+    assert histogram.percentile(90) == pytest.approx(1.0, rel=0.02)
+    now[0] = 25
+    assert histogram.count == 10
+    assert histogram.percentile(90) == pytest.approx(0.01, rel=0.02)
+    now[0] = 100
+    assert histogram.count == 0
+    assert histogram.percentile(90) is None
@@ -0,0 +1,218 @@
+import pytest
+
+from rrpproxypy import parser
+
+from reference_parser import configparser_response_to_dict
+
+
+def domain_list_response(rows):
+    """
+    Generate a QueryDomainList response with the given number of rows.
+
+    """
+    lines = [
+        '[RESPONSE]',
+        'code = 200',
+        'description = Command completed successfully',
+        'queuetime = 0',
+        'runtime = 0.042',
+        'property[count][0] = {}'.format(rows),
+        'property[column][0] = domain',
+        'property[column][1] = domain created date',
+    ]
+    for row in range(rows):
+        lines.append('property[domain][{}] = example{}.com'.format(row, row))
+        lines.append(
+            'property[domain created date][{}] = 2019-02-15 10:00:00'.format(
+                row))
+    lines.append('EOF')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+RESPONSES = [
+    domain_list_response(1),
+    domain_list_response(2),
+    domain_list_response(25),
+    (
+        '[RESPONSE]\n'
+        'code = 200\n'
+        'description = Command completed successfully\n'
+        'property[Converted Amount][0] = 85.91\n'
+        'property[exchangerate][0] =\n'
+        'property[from][0] = USD\n'
+        'EOF\n'
+    ),
+    (
+        '[RESPONSE]\n'
+        'code = 200\n'
+        'description = Command completed successfully\n'
+        'property[rate][10] = 3\n'
+        'property[rate][2] = 1\n'
+        'property[rate][5] = 2\n'
+        'property[other][1] = b\n'
+        'property[other][0] = a\n'
+        'EOF\n'
+    ),
+]
+
+
+@pytest.mark.parametrize('text', RESPONSES)
+def test_same_as_configparser(
+        text):
+    """
+    Test if the output is identical to the configparser based parser.
+
+    """
+    assert parser.parse_response(text) == (
+        configparser_response_to_dict(text))
+
+
+def test_values_are_ordered_by_index():
+    """
+    Test if values are ordered by index, also when sent out of order.
+
+    """
+    response = parser.parse_response(RESPONSES[-1])
+    assert response['properties'] == {
+        'rate': ['1', '2', '3'],
+        'other': ['a', 'b'],
+    }
+
+
+def test_without_properties():
+    """
+    Test if a response without properties can be parsed.
+
+    """
+    response = parser.parse_response(
+        '[RESPONSE]\n'
+        'code = 545\n'
+        'description = Entity reference not found\n'
+        'EOF\n')
+    assert response == {
+        'code': '545',
+        'description': 'Entity reference not found',
+    }
+
+
+def test_rows():
+    """
+    Test if a list response can be read row by row.
+
+    """
+    response = parser.parse_response(domain_list_response(3))
+    rows = response.rows()
+    assert len(rows) == 3
+    assert rows[1] == {
+        'domain': 'example1.com',
+        'domain created date': '2019-02-15 10:00:00',
+    }
+    assert rows[-1]['domain'] == 'example2.com'
+    assert [row['domain'] for row in rows] == [
+        'example0.com',
+        'example1.com',
+        'example2.com',
+    ]
+
+
+def test_rows_share_columns():
+    """
+    Test if all records share a single column table.
+
+    """
+    rows = list(parser.parse_response(domain_list_response(2)).rows())
+    assert rows[0]._columns is rows[1]._columns
+
+
+def test_rows_single_row():
+    """
+    Test if a response with a single row has a single record.
+
+    """
+    rows = parser.parse_response(domain_list_response(1)).rows()
+    assert list(rows) == [{
+        'domain': 'example0.com',
+        'domain created date': '2019-02-15 10:00:00',
+    }]
+
+
+def test_rows_without_column_property():
+    """
+    Test if all properties are used as columns without a column property.
+
+    """
+    response = parser.parse_response(RESPONSES[-1])
+    assert list(response.rows()) == [
+        {'rate': '1', 'other': 'a'},
+        {'rate': '2', 'other': 'b'},
+        {'rate': '3', 'other': None},
+    ]
+
+
+def test_single_values_keep_dict_access():
+    """
+    Test if single value properties can still be accessed as a dict.
+
+    """
+    response = parser.parse_response(domain_list_response(3))
+    assert response['properties']['count'] == '3'
+    assert response['code'] == '200'
+
+
+@pytest.mark.parametrize('text', RESPONSES)
+def test_row_stream_same_as_rows(
+        text):
+    """
+    Test if a streamed response has the same rows and other properties.
+
+    """
+    response = parser.parse_response(text)
+    stream = parser.RowStream(text.splitlines())
+    assert list(stream) == list(response.rows())
+    assert stream.response['code'] == response['code']
+    properties = response['properties']
+    for name, value in stream.response['properties'].items():
+        assert properties[name] == value
+
+
+def test_row_stream_yields_early():
+    """
+    Test if rows are yielded before the whole response is parsed.
+
+    """
+    lines = iter(domain_list_response(100).splitlines())
+    stream = iter(parser.RowStream(lines))
+    assert next(stream)['domain'] == 'example0.com'
+    assert len(list(lines)) > 190
+
+
+def test_row_stream_by_column():
+    """
+    Test if rows sent column by column and with gaps are complete.
+
+    """
+    lines = [
+        '[RESPONSE]',
+        'code = 200',
+        'property[column][0] = domain',
+        'property[column][1] = zone',
+        'property[domain][0] = a.com',
+        'property[domain][1] = b.net',
+        'property[domain][2] = c.org',
+        'property[zone][1] = net',
+        'property[zone][0] = com',
+        'property[total][0] = 3',
+        'EOF',
+    ]
+    stream = parser.RowStream(lines)
+    assert list(stream) == [
+        {'domain': 'a.com', 'zone': 'com'},
+        {'domain': 'b.net', 'zone': 'net'},
+        {'domain': 'c.org', 'zone': None},
+    ]
+    assert stream.response['properties'] == {
+        'column': ['domain', 'zone'],
+        'total': '3',
+    }
+    assert list(parser.RowStream(lines, columns=['zone'])) == [
+        {'zone': 'com'}, {'zone': 'net'}]
@@ -0,0 +1,156 @@
+from unittest import mock
+import itertools
+import json
+
+import pytest
+
+from rrpproxypy import parser
+from rrpproxypy import pipeline
+
+
+def response(code):
+    return parser.Response({'code': str(code), 'description': 'Described'})
+
+
+@pytest.fixture
+def client():
+    """
+    A client renewing domains, with outcomes by domain name.
+
+    """
+    def request(command, domain):
+        if domain.startswith('temporary'):
+            return response(421)
+        if domain.startswith('failed'):
+            return response(541)
+        if domain.startswith('broken'):
+            raise ConnectionError('Connection reset')
+        return response(200)
+
+    client = mock.Mock()
+    client.request.side_effect = request
+    return client
+
+
+def jobs(*domains):
+    return [('RenewDomain', {'domain': domain}) for domain in domains]
+
+
+def test_job_key():
+    """
+    Test if job keys don't depend on the order or case of the arguments.
+
+    """
+    assert pipeline.job_key(
+        'RenewDomain',
+        {'domain': 'a.com', 'period': 1}) == pipeline.job_key(
+        'renewdomain',
+        {'PERIOD': '1', 'domain': 'a.com'})
+
+
+@pytest.mark.parametrize('code, status', [
+    (200, pipeline.DONE),
+    (210, pipeline.DONE),
+    (421, pipeline.TEMPORARY),
+    (541, pipeline.FAILED),
+    (0, pipeline.UNKNOWN),
+    (-1, pipeline.UNKNOWN),
+    ('', pipeline.UNKNOWN),
+])
+def test_interpret(
+        code,
+        status):
+    """
+    Test if response codes are interpreted.
+
+    """
+    assert pipeline.interpret(response(code)) == status
+
+
+def test_response_without_code_is_unknown(
+        client,
+        tmp_path):
+    """
+    Test if a response without a code (e.g. an HTML error page) is
+    journaled as unknown, so a rerun doesn't treat it as a permanent error.
+
+    """
+    client.request.side_effect = None
+    client.request.return_value = parser.parse_response(
+        '<html><body>503 Service Unavailable</body></html>')
+    path = str(tmp_path / 'journal.jsonl')
+    with pipeline.Journal(path) as journal:
+        outcomes = list(pipeline.run_jobs(client, jobs('a.com'), journal))
+    assert [outcome.status for outcome in outcomes] == [pipeline.UNKNOWN]
+    assert outcomes[0].code is None
+    assert pipeline.interpret({}) == pipeline.UNKNOWN
+
+
+def test_run_jobs(
+        client,
+        tmp_path):
+    """
+    Test if outcomes are journaled and a rerun skips finished jobs.
+
+    """
+    path = str(tmp_path / 'journal.jsonl')
+    domains = ['a.com', 'temporary.com', 'failed.com', 'broken.com', 'a.com']
+    with pipeline.Journal(path) as journal:
+        outcomes = {
+            outcome.args['domain']: outcome
+            for outcome in pipeline.run_jobs(client, jobs(*domains), journal)}
+    assert client.request.call_count == 4
+    assert outcomes['a.com'].status == pipeline.DONE
+    assert outcomes['a.com'].code == 200
+    assert outcomes['temporary.com'].status == pipeline.TEMPORARY
+    assert outcomes['failed.com'].status == pipeline.FAILED
+    assert outcomes['broken.com'].status == pipeline.UNKNOWN
+    assert outcomes['broken.com'].description == (
+        'ConnectionError: Connection reset')
+
+    client.request.reset_mock()
+    with pipeline.Journal(path) as journal:
+        assert journal.counts()[pipeline.DONE] == 1
+        rerun = list(pipeline.run_jobs(client, jobs(*domains), journal))
+        assert [outcome.args['domain'] for outcome in rerun] == [
+            'temporary.com']
+        rerun = list(pipeline.run_jobs(
+            client,
+            jobs(*domains),
+            journal,
+            retry_unknown=True))
+        assert sorted(outcome.args['domain'] for outcome in rerun) == [
+            'broken.com', 'temporary.com']
+
+
+def test_resume_after_crash(
+        client,
+        tmp_path):
+    """
+    Test if a crashed run resumes with the jobs which didn't complete.
+
+    """
+    path = str(tmp_path / 'journal.jsonl')
+    domains = ['domain{}.com'.format(i) for i in range(50)]
+    with pipeline.Journal(path, sync=False) as journal:
+        outcomes = pipeline.run_jobs(client, jobs(*domains), journal)
+        list(itertools.islice(outcomes, 20))
+        outcomes.close()
+    with open(path, 'a') as file:
+        file.write(json.dumps({
+            'key': pipeline.job_key('RenewDomain', {'domain': 'crash.com'}),
+            'command': 'RenewDomain',
+            'args': {'domain': 'crash.com'},
+            'status': pipeline.STARTED,
+        }) + '\n')
+        file.write('{"key": "cut sh')
+    client.request.reset_mock()
+    with pipeline.Journal(path) as journal:
+        done = set(journal.outcomes)
+        rerun = list(pipeline.run_jobs(
+            client,
+            jobs(*domains + ['crash.com']),
+            journal))
+    assert len(done) >= 20 + 1
+    assert len(done) + len(rerun) == 50 + 1
+    assert client.request.call_count == len(rerun)
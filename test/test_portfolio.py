@@ -0,0 +1,224 @@
+import datetime
+from unittest import mock
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import portfolio
+from rrpproxypy import standin
+
+
+@pytest.fixture
+def server():
+    """
+    A running stand-in server with 30 domains.
+
+    """
+    with standin.StandInServer(standin.StandIn(
+            domains=standin.make_domains(30))) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    """
+    A client using the stand-in server.
+
+    """
+    with rrpproxypy.RRPproxy(
+            'username',
+            'password',
+            url=server.url) as client:
+        yield client
+
+
+@pytest.fixture
+def store():
+    """
+    An in-memory portfolio store.
+
+    """
+    with portfolio.PortfolioStore(':memory:') as store:
+        yield store
+
+
+def test_initial_sync(
+        store,
+        client):
+    """
+    Test if the first sync fetches all domains.
+
+    """
+    assert store.sync(client, page_size=7) == 30
+    assert len(store) == 30
+    assert store.watermark == max(
+        domain['domain updated date']
+        for domain in standin.make_domains(30))
+
+
+def test_delta_sync(
+        store,
+        client,
+        server):
+    """
+    Test if later syncs only fetch domains updated since the watermark.
+
+    """
+    store.sync(client)
+    domain = server.standin.domains[3]
+    domain['domain updated date'] = '2030-01-01 00:00:00'
+    domain['renewalmode'] = 'AUTOEXPIRE'
+    # The domain updated at the watermark is fetched again.
+    assert store.sync(client) == 2
+    record, = [
+        record for record in store.find(zone='com')
+        if record['domain'] == domain['domain']]
+    assert record['renewalmode'] == 'AUTOEXPIRE'
+
+
+def test_full_sync_removes_domains(
+        store,
+        client,
+        server):
+    """
+    Test if a full sync removes domains no longer in the portfolio.
+
+    """
+    store.sync(client)
+    del server.standin.domains[:10]
+    store.sync(client, full=True)
+    assert len(store) == 20
+
+
+def test_interrupted_sync_resumes(
+        store,
+        client):
+    """
+    Test if a sync resumes from the watermark of the last stored page.
+
+    """
+    store_page = store._store
+
+    def crash_after_first_page(records, generation):
+        if len(store):
+            raise RuntimeError('crash')
+        return store_page(records, generation)
+
+    with mock.patch.object(store, '_store', crash_after_first_page):
+        with pytest.raises(RuntimeError):
+            store.sync(client, page_size=5)
+    assert len(store) == 5
+    iter_domains = mock.Mock(wraps=client.iter_domains)
+    with mock.patch.object(client, 'iter_domains', iter_domains):
+        store.sync(client, page_size=5)
+    assert portfolio.UPDATED_AFTER in iter_domains.call_args[1]
+    assert len(store) == 30
+
+
+def test_find(
+        store,
+        client):
+    """
+    Test if domains can be found by zone and expiration date.
+
+    """
+    store.sync(client)
+    domains = store.find(
+        zone='NET',
+        expires_before=datetime.datetime(2020, 1, 6))
+    assert [domain['domain'] for domain in domains] == [
+        'domain1.net',
+        'domain4.net',
+    ]
+    assert len(store.expiring(
+        365,
+        now=datetime.datetime(2019, 12, 31))) == 30
+
+
+@pytest.fixture
+def domains():
+    """
+    A synthetic portfolio.
+
+    """
+    return standin.make_domains(300)
+
+
+def brute_force(
+        domains,
+        zone=None,
+        expires_after=None,
+        expires_before=None):
+    """
+    Find domains by scanning them all.
+
+    """
+    found = []
+    for domain in domains:
+        expires = datetime.datetime.strptime(
+            domain['domain registration expiration date'],
+            portfolio.DATE_FORMAT)
+        if ((zone is None or domain['domain zone'] == zone) and
+                (expires_after is None or expires >= expires_after) and
+                (expires_before is None or expires < expires_before)):
+            found.append((expires, domain['domain']))
+    return [name for _, name in sorted(found)]
+
+
+@pytest.mark.parametrize('query', [
+    {},
+    {'zone': 'net'},
+    {'zone': 'com', 'expires_after': datetime.datetime(2020, 3, 1)},
+    {'expires_after': datetime.datetime(2020, 2, 1),
+     'expires_before': datetime.datetime(2020, 6, 1)},
+    {'zone': 'net', 'expires_before': datetime.datetime(2020, 2, 1)},
+    {'zone': 'nl'},
+])
+def test_index_find(
+        domains,
+        query):
+    """
+    Test if the index finds the same domains as a scan.
+
+    """
+    index = portfolio.PortfolioIndex(domains)
+    assert index.find(**query) == brute_force(domains, **query)
+
+
+def test_index_get(
+        domains):
+    """
+    Test if domains can be looked up by name.
+
+    """
+    index = portfolio.PortfolioIndex(domains)
+    assert len(index) == 300
+    assert 'domain7.net' in index
+    assert index.get('domain7.net') == {
+        'domain': 'domain7.net',
+        'domain zone': 'net',
+        'domain registration expiration date': datetime.datetime(
+            2020, 1, 8, 7),
+    }
+    assert index.get('unknown.com') is None
+
+
+def test_index_from_response(
+        client):
+    """
+    Test if an index can be built from a domain list response.
+
+    """
+    index = portfolio.PortfolioIndex.from_response(client.request(
+        'QueryDomainList',
+        wide=1))
+    assert len(index) == 30
+    assert index.expiring(7, now=datetime.datetime(2020, 1, 1)) == [
+        'domain0.com',
+        'domain1.net',
+        'domain2.org',
+        'domain3.com',
+        'domain4.net',
+        'domain5.org',
+        'domain6.com',
+    ]
@@ -0,0 +1,153 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from rrpproxypy import exceptions
+from rrpproxypy import pricing
+
+
+class Client:
+    """
+    A fake client answering GetZoneInfo and DomainPrice.
+
+    DomainPrice fails for the types in `failing`, `RESTOREDOMAIN` by
+    default, and answers without a price for `TRADEDOMAIN`. GetZoneInfo
+    answers with an error code for the zones in `unavailable`.
+
+    """
+    def __init__(self):
+        self.zone_info = {
+            'com': {'periods': '1,2'},
+            'net': {'periods': '1'},
+        }
+        self.failing = {'RESTOREDOMAIN'}
+        self.unavailable = set()
+        self.domain_price = mock.Mock(side_effect=self._domain_price)
+
+    def get_zone_info(self, zone):
+        if zone in self.unavailable:
+            return {'code': '421', 'description': 'Try again'}
+        return {'code': '200', 'properties': dict(self.zone_info[zone])}
+
+    def _domain_price(self, domain, type, period):
+        if type in self.failing:
+            raise exceptions.Failure('Invalid attribute value')
+        if type == 'TRADEDOMAIN':
+            return {'code': '200', 'properties': {'currency': 'USD'}}
+        return {
+            'code': '200',
+            'properties': {
+                'price': '{}.5000'.format(len(domain) * period),
+                'currency': 'USD',
+            },
+        }
+
+
+@pytest.fixture
+def client():
+    return Client()
+
+
+@pytest.fixture
+def matrix(client):
+    """
+    A price matrix built using the fake client.
+
+    """
+    return pricing.PriceMatrix.build(
+        client,
+        ['COM', 'net'],
+        actions=['ADDDOMAIN', 'RENEWDOMAIN', 'RESTOREDOMAIN'],
+        periods=[1, 2])
+
+
+def test_build(
+        matrix,
+        client):
+    """
+    Test if every cell is fetched and failures are recorded.
+
+    """
+    assert client.domain_price.call_count == 12
+    assert len(matrix) == 8
+    assert matrix['com', 'ADDDOMAIN', 2] == pricing.Price(
+        Decimal('22.5000'),
+        'USD')
+    assert matrix.get('net', 'renewdomain') == pricing.Price(
+        Decimal('11.5000'),
+        'USD')
+    assert matrix.get('com', 'RESTOREDOMAIN') is None
+    assert ('com', 'RESTOREDOMAIN', 1) not in matrix
+    assert isinstance(
+        matrix.errors['com', 'RESTOREDOMAIN', 1],
+        exceptions.Failure)
+
+
+def test_save_and_load(
+        matrix,
+        tmp_path):
+    """
+    Test if a saved matrix can be loaded again.
+
+    """
+    path = str(tmp_path / 'prices.json')
+    matrix.save(path)
+    loaded = pricing.PriceMatrix.load(path)
+    assert loaded.prices == matrix.prices
+    assert loaded.fingerprints == matrix.fingerprints
+    assert str(loaded.errors['com', 'RESTOREDOMAIN', 1]) == (
+        'Failure: Invalid attribute value')
+
+
+def test_refresh_only_changed_zones(
+        matrix,
+        client):
+    """
+    Test if only zones whose zone info changed, or which have failed, are
+    refetched.
+
+    """
+    client.failing = set()
+    assert matrix.refresh(client, periods=[1, 2]) == ['com', 'net']
+    assert matrix.errors == {}
+    client.domain_price.reset_mock()
+    assert matrix.refresh(client, periods=[1, 2]) == []
+    client.domain_price.assert_not_called()
+    client.zone_info['net']['periods'] = '1,2'
+    assert matrix.refresh(client, periods=[1, 2]) == ['net']
+    assert {
+        call[0][0] for call in client.domain_price.call_args_list
+    } == {'example.net'}
+
+
+def test_malformed_price_fails_its_cell(
+        client):
+    """
+    Test if a response without a price only fails its own cell.
+
+    """
+    matrix = pricing.PriceMatrix.build(
+        client,
+        ['com'],
+        actions=['ADDDOMAIN', 'TRADEDOMAIN'])
+    assert len(matrix) == 1
+    assert isinstance(matrix.errors['com', 'TRADEDOMAIN', 1], KeyError)
+
+
+def test_refresh_with_unavailable_zone_info(
+        matrix,
+        client):
+    """
+    Test if a zone of which the zone info returns an error is refetched
+    without replacing its fingerprint.
+
+    """
+    client.failing = set()
+    matrix.refresh(client, periods=[1, 2])
+    fingerprint = matrix.fingerprints['net']
+    client.unavailable = {'net'}
+    assert matrix.refresh(client, periods=[1, 2]) == ['net']
+    assert matrix.fingerprints['net'] == fingerprint
+    client.unavailable = set()
+    assert matrix.refresh(client, periods=[1, 2]) == []
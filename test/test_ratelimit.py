@@ -0,0 +1,176 @@
+from unittest import mock
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import ratelimit
+
+
+@pytest.fixture
+def limiter(clock):
+    """
+    A rate limiter of ten calls per second.
+
+    """
+    return ratelimit.RateLimiter(
+        10,
+        burst=1,
+        clock=clock,
+        sleep=clock.sleep)
+
+
+def test_acquire_waits_for_tokens(
+        limiter,
+        clock):
+    """
+    Test if calls are spread out at the configured rate.
+
+    """
+    for _ in range(11):
+        limiter.acquire()
+    assert clock.time == pytest.approx(1.0)
+
+
+def test_throttled_backs_off_once_per_cooldown(
+        limiter,
+        clock):
+    """
+    Test if the rate is decreased once for a burst of throttled calls.
+
+    """
+    limiter.throttled()
+    limiter.throttled()
+    assert limiter.rate == 5
+    clock.time += 1
+    limiter.throttled()
+    assert limiter.rate == 2.5
+    for _ in range(2):
+        clock.time += 1
+        limiter.throttled()
+    assert limiter.rate == 1
+
+
+def test_succeeded_recovers_rate(
+        limiter):
+    """
+    Test if successful calls increase the rate up to the maximum.
+
+    """
+    limiter.throttled()
+    for _ in range(49):
+        limiter.succeeded()
+    assert limiter.rate == pytest.approx(9.9)
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.rate == 10
+
+
+def test_file_limiter_is_shared(
+        tmp_path,
+        clock):
+    """
+    Test if rate limiters using the same file share their state.
+
+    """
+    path = str(tmp_path / 'limiter')
+    first, second = [
+        ratelimit.FileRateLimiter(
+            path,
+            10,
+            burst=2,
+            clock=clock,
+            sleep=clock.sleep)
+        for _ in range(2)]
+    first.acquire()
+    second.acquire()
+    assert clock.time == 0
+    first.acquire()
+    assert clock.time == pytest.approx(0.1)
+    second.throttled()
+    assert first.rate == 5
+    first.close()
+    second.close()
+
+
+def test_file_limiter_survives_reboot(
+        tmp_path,
+        clock):
+    """
+    Test if a state file written before the clock restarted (e.g. before a
+    reboot) doesn't make callers wait.
+
+    """
+    path = str(tmp_path / 'limiter')
+    clock.time = 1e6
+    before = ratelimit.FileRateLimiter(
+        path,
+        10,
+        burst=2,
+        clock=clock,
+        sleep=clock.sleep)
+    before.acquire()
+    before.throttled()
+    before.close()
+    clock.time = 50
+    after = ratelimit.FileRateLimiter(
+        path,
+        10,
+        burst=2,
+        clock=clock,
+        sleep=clock.sleep)
+    # The bucket was emptied by the throttle, so a token takes 1 / 5 s.
+    after.acquire()
+    assert clock.time == pytest.approx(50.2)
+    after.throttled()
+    assert after.rate == 2.5
+    after.close()
+
+
+def test_client_retries_throttled_calls(
+        limiter):
+    """
+    Test if the client retries throttled calls and backs off.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        rate_limiter=limiter)
+    client.session.get = mock.Mock(side_effect=[
+        mock.Mock(status_code=200, text=(
+            '[RESPONSE]\ncode = 421\ndescription = Try again\nEOF\n')),
+        mock.Mock(status_code=200, text=(
+            '[RESPONSE]\ncode = 200\ndescription = OK\nEOF\n')),
+    ])
+    response = client.request('StatusDomain', domain='example.com')
+    assert response['code'] == '200'
+    assert client.session.get.call_count == 2
+    assert limiter.rate == pytest.approx(5.1)
+
+
+def test_client_does_not_resend_throttled_mutations(
+        limiter):
+    """
+    Test if a throttled mutation is only sent again when it hasn't run.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        rate_limiter=limiter)
+    throttled = mock.Mock(status_code=200, text=(
+        '[RESPONSE]\ncode = 421\ndescription = Try again\nEOF\n'))
+    client.session.get = mock.Mock(return_value=throttled)
+    response = client.request('RenewDomain', domain='example.com', period=1)
+    assert response['code'] == '421'
+    assert client.session.get.call_count == 1
+    assert limiter.rate == pytest.approx(5)
+
+    client.session.get = mock.Mock(side_effect=[
+        mock.Mock(status_code=429, text=''),
+        mock.Mock(status_code=200, text=(
+            '[RESPONSE]\ncode = 200\ndescription = OK\nEOF\n')),
+    ])
+    response = client.request('RenewDomain', domain='example.com', period=1)
+    assert response['code'] == '200'
+    assert client.session.get.call_count == 2
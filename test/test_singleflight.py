@@ -0,0 +1,90 @@
+from unittest import mock
+import threading
+import time
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import singleflight
+
+
+def test_identical_calls_are_collapsed():
+    """
+    Test if concurrent calls with the same key share one call.
+
+    """
+    flight = singleflight.SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def function():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return 'result'
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(flight.do('key', function)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(
+            target=lambda: results.append(flight.do('key', function)))
+        for _ in range(5)]
+    for follower in followers:
+        follower.start()
+    while flight.collapsed < 5:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+    assert results == ['result'] * 6
+    assert len(calls) == 1
+    assert flight.collapsed == 5
+
+
+def test_sequential_calls_are_not_collapsed():
+    """
+    Test if a call is made again once the previous call has finished.
+
+    """
+    flight = singleflight.SingleFlight()
+    function = mock.Mock(return_value='result')
+    flight.do('key', function)
+    flight.do('key', function)
+    assert function.call_count == 2
+    assert flight.collapsed == 0
+
+
+def test_errors_are_raised():
+    """
+    Test if an exception is raised to the caller.
+
+    """
+    flight = singleflight.SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('key', mock.Mock(side_effect=ValueError))
+    assert flight.do('key', lambda: 'result') == 'result'
+
+
+def test_client_coalesces_read_only_commands():
+    """
+    Test if the client only coalesces read-only commands.
+
+    """
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        coalesce=True)
+    client.single_flight.do = mock.Mock(return_value={'code': '200'})
+    client._call = mock.Mock(return_value={'code': '200'})
+    client.get_zone_info('com')
+    client.single_flight.do.assert_called_once_with(
+        ('getzoneinfo', (('zone', 'com'),)),
+        mock.ANY)
+    client.request('ModifyDomain', domain='example.com')
+    client._call.assert_called_once_with(
+        'ModifyDomain',
+        {'domain': 'example.com'})
@@ -0,0 +1,169 @@
+import pytest
+
+import rrpproxypy
+from rrpproxypy import standin
+
+
+@pytest.fixture
+def server():
+    """
+    A running stand-in server with 25 domains.
+
+    """
+    with standin.StandInServer(standin.StandIn(
+            domains=standin.make_domains(25),
+            seed=0)) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    """
+    A client using the stand-in server.
+
+    """
+    with rrpproxypy.RRPproxy(
+            'username',
+            'password',
+            url=server.url) as client:
+        yield client
+
+
+def test_status_domain(
+        client):
+    """
+    Test if a domain of the portfolio has a status.
+
+    """
+    response = client.status_domain('domain3.com')
+    assert response['code'] == '200'
+    assert response['properties']['domain'] == 'domain3.com'
+    assert client.status_domain('unknown.com')['code'] == '545'
+
+
+def test_iter_domains(
+        client):
+    """
+    Test if the portfolio can be paged through.
+
+    """
+    domains = [record['domain'] for record in client.iter_domains(10)]
+    assert domains == [
+        domain['domain'] for domain in standin.make_domains(25)]
+
+
+def test_iter_domains_with_capped_limit():
+    """
+    Test if all domains are yielded when the API returns smaller pages than
+    asked for.
+
+    """
+    with standin.StandInServer(standin.StandIn(
+            domains=standin.make_domains(250),
+            max_limit=100)) as server:
+        with rrpproxypy.RRPproxy(
+                'username',
+                'password',
+                url=server.url) as client:
+            domains = [
+                record['domain'] for record in client.iter_domains(1000)]
+        assert server.standin.calls == 3
+    assert domains == [
+        domain['domain'] for domain in standin.make_domains(250)]
+
+
+def test_unknown_command(
+        client):
+    """
+    Test if an unknown command fails.
+
+    """
+    assert client.request('Unknown')['code'] == '500'
+
+
+def test_error_rate(
+        server,
+        client):
+    """
+    Test if calls fail at the configured error rate.
+
+    """
+    server.standin.error_rate = 1.0
+    assert client.get_zone_info('com')['code'] == '421'
+
+
+def test_throttling(
+        server,
+        client):
+    """
+    Test if calls over the throttle rate get HTTP status 429.
+
+    """
+    server.standin.throttle_rate = 2
+    codes = [client.get_zone_info('com')['code'] for _ in range(3)]
+    assert '429' in codes
+
+
+def test_check_domains(
+        client):
+    """
+    Test if checks are chunked and mapped back to the domains.
+
+    """
+    domains = ['domain{}.com'.format(i) for i in range(0, 25, 3)]
+    domains += ['free{}.com'.format(i) for i in range(50)]
+    results = {
+        result.input: result
+        for result in client.check_domains(domains, chunk_size=8)}
+    assert sorted(results) == sorted(domains)
+    for domain, result in results.items():
+        assert result.error is None
+        code = result.response['domaincheck'].split()[0]
+        assert code == ('210' if domain.startswith('free') else '211')
+
+
+def test_post(
+        server):
+    """
+    Test if calls with large arguments are sent as a POST form body.
+
+    """
+    with rrpproxypy.RRPproxy(
+            'username',
+            'password',
+            url=server.url,
+            post_threshold=100) as client:
+        results = list(client.check_domains(
+            ['free{}.com'.format(i) for i in range(32)]))
+        assert all(result.error is None for result in results)
+        assert client.status_domain('domain3.com')['code'] == '200'
+
+
+def test_compressed(
+        server,
+        client):
+    """
+    Test if large responses are compressed on the wire.
+
+    """
+    reply = client.session.get(server.url + 'api/call?command=QueryDomainList')
+    assert reply.headers['Content-Encoding'] == 'gzip'
+    assert int(reply.headers['Content-Length']) < len(reply.text) / 2
+
+
+def test_stream(
+        client):
+    """
+    Test if a domain list can be streamed.
+
+    """
+    domains = [
+        record['domain']
+        for record in client.stream(
+            'QueryDomainList',
+            wide=1,
+            limit=100)]
+    assert domains == [
+        domain['domain'] for domain in standin.make_domains(25)]
+    with pytest.raises(rrpproxypy.exceptions.Failure):
+        list(client.stream('Unknown'))
@@ -0,0 +1,91 @@
+from unittest import mock
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import exceptions
+from rrpproxypy import transports
+
+
+def reply(text):
+    return transports.Reply(200, (
+        '[RESPONSE]\ncode = 200\ndescription = {}\nEOF\n'.format(text)))
+
+
+def test_call_key_ignores_credentials():
+    """
+    Test if call keys don't depend on credentials or argument order.
+
+    """
+    assert transports.call_key(
+        'https://api.rrpproxy.net/api/call?s_login=a&s_pw=b'
+        '&command=StatusDomain&domain=example.com') == transports.call_key(
+        'https://api-ote.rrpproxy.net/api/call?domain=example.com'
+        '&s_sessionid=c&command=StatusDomain')
+
+
+def test_record_and_replay(
+        tmp_path):
+    """
+    Test if recorded replies are replayed.
+
+    """
+    path = str(tmp_path / 'recording.jsonl')
+    live = mock.Mock()
+    live.get.side_effect = [reply('first'), reply('second')]
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        transport=transports.RecordingTransport(live, path))
+    client.status_domain('example.com')
+    client.status_domain('example.com')
+    with open(path) as file:
+        assert 'password' not in file.read()
+
+    client = rrpproxypy.RRPproxy(
+        'other',
+        'secret',
+        transport=transports.ReplayTransport(path))
+    descriptions = [
+        client.status_domain('example.com')['description']
+        for _ in range(3)]
+    assert descriptions == ['first', 'second', 'second']
+    with pytest.raises(exceptions.NotRecorded):
+        client.status_domain('example.org')
+
+
+def test_call_key_post():
+    """
+    Test if POST calls have the same key as the equivalent GET call.
+
+    """
+    assert transports.call_key(
+        'https://api.rrpproxy.net/api/call',
+        's_login=a&command=StatusDomain&domain=example.com') == (
+        transports.call_key(
+            'https://api.rrpproxy.net/api/call?command=StatusDomain'
+            '&domain=example.com'))
+
+
+def test_record_and_replay_post(
+        tmp_path):
+    """
+    Test if POST calls are recorded and replayed.
+
+    """
+    path = str(tmp_path / 'recording.jsonl')
+    live = mock.Mock()
+    live.post.return_value = reply('posted')
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        transport=transports.RecordingTransport(live, path),
+        post_threshold=0)
+    client.status_domain('example.com')
+
+    client = rrpproxypy.RRPproxy(
+        'username',
+        'password',
+        transport=transports.ReplayTransport(path),
+        post_threshold=0)
+    assert client.status_domain('example.com')['description'] == 'posted'
@@ -0,0 +1,190 @@
+from unittest import mock
+import threading
+import time
+
+import pytest
+
+import rrpproxypy
+from rrpproxypy import parser
+from rrpproxypy import standin
+from rrpproxypy import zonecache
+
+
+def zone_response(code=200):
+    return parser.Response({
+        'code': str(code),
+        'description': 'Command completed successfully',
+        'properties': {'periods': '1,2,3'},
+    })
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'zones.sqlite')
+
+
+@pytest.fixture
+def client():
+    client = mock.Mock()
+    client.request.return_value = zone_response()
+    return client
+
+
+def test_get_caches(
+        path,
+        clock,
+        client):
+    """
+    Test if a zone is fetched once while it is fresh.
+
+    """
+    cache = zonecache.ZoneInfoCache(path, max_age=60, clock=clock)
+    assert cache.get(client, 'COM') == zone_response()
+    assert cache.get(client, 'com') == zone_response()
+    assert client.request.call_count == 1
+    client.request.assert_called_with('GetZoneInfo', zone='com')
+    assert cache.entry('com')[1] == 0
+    clock.time += 60
+    cache.get(client, 'com')
+    assert client.request.call_count == 2
+    assert len(cache) == 1
+
+
+def test_shared_between_instances(
+        path,
+        clock,
+        client):
+    """
+    Test if another process sees the cached zones.
+
+    """
+    zonecache.ZoneInfoCache(path, clock=clock).get(client, 'com')
+    other = zonecache.ZoneInfoCache(path, clock=clock)
+    assert other.fresh('com') == zone_response()
+    other.invalidate('com')
+    assert other.fresh('com') is None
+
+
+def test_failures_are_not_cached(
+        path,
+        client):
+    """
+    Test if failed calls are not cached.
+
+    """
+    client.request.return_value = zone_response(541)
+    cache = zonecache.ZoneInfoCache(path)
+    assert cache.get(client, 'invalid')['code'] == '541'
+    assert cache.entry('invalid') is None
+    assert cache._claim('invalid')
+
+
+def test_single_refresh(
+        path,
+        client):
+    """
+    Test if concurrent misses fetch a zone only once.
+
+    """
+    def request(command, **args):
+        time.sleep(0.1)
+        return zone_response()
+
+    client.request.side_effect = request
+    responses = []
+
+    def get():
+        cache = zonecache.ZoneInfoCache(path, poll_interval=0.01)
+        responses.append(cache.get(client, 'com'))
+
+    threads = [threading.Thread(target=get) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert responses == [zone_response()] * 5
+    assert client.request.call_count == 1
+
+
+def test_refreshed_before_claim(
+        path,
+        clock,
+        client):
+    """
+    Test if a zone refreshed by another process between the check and the
+    claim isn't fetched again.
+
+    """
+    cache = zonecache.ZoneInfoCache(path, clock=clock)
+    other = zonecache.ZoneInfoCache(path, clock=clock)
+    claim = cache._claim
+
+    def refresh_then_claim(zone):
+        other.set(zone, zone_response())
+        return claim(zone)
+
+    with mock.patch.object(cache, '_claim', refresh_then_claim):
+        assert cache.get(client, 'com') == zone_response()
+    client.request.assert_not_called()
+    assert other._claim('com')
+
+
+def test_abandoned_claim(
+        path,
+        clock,
+        client):
+    """
+    Test if an abandoned claim is taken over.
+
+    """
+    crashed = zonecache.ZoneInfoCache(path, clock=clock)
+    assert crashed._claim('com')
+    sleep = mock.Mock(side_effect=lambda seconds: setattr(
+        clock,
+        'time',
+        clock.time + 10))
+    cache = zonecache.ZoneInfoCache(
+        path,
+        lock_timeout=30,
+        clock=clock,
+        sleep=sleep)
+    assert cache.get(client, 'com') == zone_response()
+    assert sleep.call_count == 4
+
+
+def test_warm(
+        path,
+        client):
+    """
+    Test if many zones are fetched concurrently.
+
+    """
+    cache = zonecache.ZoneInfoCache(path)
+    zones = ['com', 'net', 'org', 'nl']
+    results = list(cache.warm(client, zones, workers=3))
+    assert sorted(result.input for result in results) == sorted(zones)
+    assert all(result.error is None for result in results)
+    assert len(cache) == 4
+    with mock.patch.object(cache, 'close', wraps=cache.close) as close:
+        list(cache.warm(client, zones))
+    assert client.request.call_count == 4
+    # The connection of a worker is closed after every zone.
+    assert close.call_count == 4
+
+
+def test_client_uses_cache(
+        path):
+    """
+    Test if get_zone_info uses the cache of the client.
+
+    """
+    cache = zonecache.ZoneInfoCache(path)
+    with standin.StandInServer() as server:
+        with rrpproxypy.RRPproxy(
+                'username',
+                'password',
+                url=server.url,
+                zone_cache=cache) as client:
+            assert client.get_zone_info('com')['properties']['zone'] == 'com'
+            client.get_zone_info('com')
+        assert server.standin.calls == 1